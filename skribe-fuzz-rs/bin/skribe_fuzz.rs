@@ -1,25 +1,23 @@
-use arbitrary::Unstructured;
 use pico_args::Arguments;
 use skribe_fuzz_rs::{
-    FuzzConfig, SignatureAbi, SignatureFuzzer, extract_template_and_signature,
-    fuzz_specs_from_json, get_coverage_size, get_exit_code,
+    FuzzConfig, SignatureAbi, SignatureFuzzer, get_coverage_size, get_exit_code,
     kllvm::{self, Marshaller},
-    kore, write_coverage_data,
+    kore, load_template_and_signature, print_calldata, write_coverage_data,
 };
 
 use std::cell::Cell;
-use std::path::PathBuf;
+use std::path::{Path, PathBuf};
 use std::ptr;
 use std::time::Duration;
 
 use libafl::{
-    Fuzzer, StdFuzzer,
-    corpus::{Corpus, InMemoryCorpus, OnDiskCorpus, Testcase},
-    events::SimpleEventManager,
+    Error, Fuzzer, StdFuzzer,
+    corpus::{Corpus, InMemoryOnDiskCorpus, OnDiskCorpus, Testcase},
+    events::{ClientDescription, EventConfig, Launcher, SendExiting},
     executors::{ExitKind, InProcessExecutor},
     feedbacks::{CrashFeedback, MaxMapFeedback},
     inputs::BytesInput,
-    monitors::SimpleMonitor,
+    monitors::MultiMonitor,
     mutators::{HavocScheduledMutator, havoc_mutations},
     nonzero,
     observers::StdMapObserver,
@@ -27,7 +25,12 @@ use libafl::{
     stages::StdMutationalStage,
     state::{HasCorpus, StdState},
 };
-use libafl_bolts::{rands::StdRand, tuples::tuple_list};
+use libafl_bolts::{
+    core_affinity::Cores,
+    rands::StdRand,
+    shmem::{ShMemProvider, StdShMemProvider},
+    tuples::tuple_list,
+};
 
 // Byte array pointer/size for the coverage updates
 // Initialized on startup
@@ -56,23 +59,47 @@ fn main() {
     let workspace: String = args
         .value_from_str("--workspace")
         .unwrap_or("./workspace".to_string());
-    let mut artifacts_path = PathBuf::from(workspace);
-    artifacts_path.push(&contract_name);
-    artifacts_path.push(&function_name);
-    artifacts_path.push("artifacts");
+    // Directories of the test function in the workspace:
+    //
+    // artifacts - failing inputs
+    // corpus    - interesting inputs, from which later campaigns resume
+    // seeds     - inputs to start from, e.g. exported by `skribe run --fuzz-workspace`
+    let mut test_path = PathBuf::from(workspace);
+    test_path.push(&contract_name);
+    test_path.push(&function_name);
+    let artifacts_path = test_path.join("artifacts");
+    let corpus_path = test_path.join("corpus");
+    let seeds_path = test_path.join("seeds");
+    // Reduce the corpus to the smallest inputs that preserve its coverage instead of fuzzing
+    let minimize: bool = args.contains("--minimize");
     let iterations: Option<u64> = args.opt_value_from_str("--iterations").unwrap_or(None);
+    // Print the calldata of a fuzzer input, e.g. an artifact, instead of fuzzing
+    let calldata_input: Option<PathBuf> = args.opt_value_from_str("--calldata").unwrap();
+    // Cores to run fuzzing clients on, e.g. `0-3` or `all`. Clients share their corpus and findings.
+    let cores: Cores = args
+        .opt_value_from_fn("--cores", Cores::from_cmdline)
+        .unwrap()
+        .unwrap_or_else(|| Cores::from_cmdline("0").unwrap());
+    let broker_port: u16 = args
+        .opt_value_from_str("--broker-port")
+        .unwrap()
+        .unwrap_or(1337);
 
-    // Parse fuzz spec
-    let contents = std::fs::read_to_string(fuzz_spec_file).unwrap();
-    let specs = fuzz_specs_from_json(&contents).unwrap();
+    // Load the fuzz spec of the test function, either JSON or binary
     let (template_str, signature) =
-        extract_template_and_signature(specs, &contract_name, &function_name).unwrap();
+        load_template_and_signature(Path::new(&fuzz_spec_file), &contract_name, &function_name)
+            .unwrap();
 
     let mut parser = kore::Parser::new(&template_str).unwrap();
     let template = parser.pattern().unwrap();
 
     let abi = SignatureAbi::from_signature(signature).unwrap();
 
+    if let Some(input_path) = calldata_input {
+        print_calldata(&abi, &input_path);
+        return;
+    }
+
     let coverage_size = get_coverage_size(&template);
 
     FUZZ_CONFIG.replace(Some(FuzzConfig {
@@ -81,85 +108,126 @@ fn main() {
         coverage,
     }));
 
-    // Create an observation channel for coverage
+    // Allocate the coverage map. Clients are forked from this process, so each gets its own copy.
     let alloc = vec![0u8; coverage_size].into_boxed_slice();
     let leaked: &'static mut [u8] = Box::leak(alloc);
     unsafe {
         SIGNALS_PTR = leaked.as_mut_ptr();
         SIGNALS_LEN = leaked.len();
     }
-    let observer = unsafe { StdMapObserver::from_mut_ptr("signals", SIGNALS_PTR, SIGNALS_LEN) };
-
-    // Feedback that rates what's interesting from the observer
-    let mut feedback = MaxMapFeedback::new(&observer);
-
-    // Feedback that rates what's a "solution" (test failure)
-    let mut objective = CrashFeedback::new();
-
-    // The State holds data that evolves over fuzzing, like the RNG state,
-    // the corpus, and metadata.
-    let mut state = StdState::new(
-        // RNG
-        StdRand::new(),
-        // Corpus that will save interesting test cases. In memory for now
-        // TODO: Save to disk once coverage updates are working.
-        InMemoryCorpus::<BytesInput>::new(),
-        // Corpus folder in which we store solutions (test failures for us)
-        OnDiskCorpus::new(artifacts_path).unwrap(),
-        &mut feedback,
-        &mut objective,
-    )
-    .unwrap();
-
-    // The Monitor trait defines how the fuzzer stats are displayed to the user
-    let mon = SimpleMonitor::new(|s| println!("{s}"));
-
-    // The event manager handles the various events generated during the fuzzing loop
-    // such as the notification of the addition of a new item to the corpus
-    let mut mgr = SimpleEventManager::new(mon);
-
-    // A queue policy to get testcases from the corpus
-    let scheduler = QueueScheduler::new();
-
-    // A fuzzer with feedbacks and a corpus scheduler
-    let mut fuzzer = StdFuzzer::new(scheduler, feedback, objective);
-
-    // The executor which runs the harness
-    let mut harness_binding = harness;
-    let mut executor = InProcessExecutor::with_timeout(
-        &mut harness_binding,
-        tuple_list!(observer),
-        &mut fuzzer,
-        &mut state,
-        &mut mgr,
-        Duration::MAX,
-    )
-    .expect("Failed to create the Executor");
-
-    // Initialize the corpus with a single byte array that will be mutated
-    // repeatedly.
-    state
-        .corpus_mut()
-        .add(Testcase::new(BytesInput::new(vec![0u8; 1024])))
-        .expect("Failed to initalize corpus");
-
-    // Setup a mutational stage with a basic bytes mutator
-    let mutator = HavocScheduledMutator::new(havoc_mutations());
-    let mut stages = tuple_list!(StdMutationalStage::with_max_iterations(
-        mutator,
-        nonzero!(1)
-    ));
-
-    if let Some(iterations) = iterations {
-        println!("Executing for {} iterations", iterations);
-        fuzzer
-            .fuzz_loop_for(&mut stages, &mut executor, &mut state, &mut mgr, iterations)
-            .expect("Error in the fuzzing loop");
-    } else {
-        println!("Executing indefinitely");
-        fuzzer
-            .fuzz_loop(&mut stages, &mut executor, &mut state, &mut mgr)
-            .expect("Error in the fuzzing loop");
+
+    if minimize {
+        assert!(coverage, "--minimize requires --coverage");
+        minimize_corpus(&corpus_path);
+        return;
+    }
+
+    match iterations {
+        Some(iterations) => println!("Executing for {} iterations per client", iterations),
+        None => println!("Executing indefinitely"),
+    }
+
+    // Runs a fuzzing client on one core. `state` is the state of the previous instance of the
+    // client if it was restarted.
+    let mut run_client = |state: Option<_>, mut mgr, _client_description: ClientDescription| {
+        // Create an observation channel for coverage
+        let observer = unsafe { StdMapObserver::from_mut_ptr("signals", SIGNALS_PTR, SIGNALS_LEN) };
+
+        // Feedback that rates what's interesting from the observer
+        let mut feedback = MaxMapFeedback::new(&observer);
+
+        // Feedback that rates what's a "solution" (test failure)
+        let mut objective = CrashFeedback::new();
+
+        // The State holds data that evolves over fuzzing, like the RNG state,
+        // the corpus, and metadata.
+        let mut state = state.unwrap_or_else(|| {
+            StdState::new(
+                // RNG
+                StdRand::new(),
+                // Corpus that will save interesting test cases, kept in memory and on disk
+                InMemoryOnDiskCorpus::<BytesInput>::new(corpus_path.clone()).unwrap(),
+                // Corpus folder in which we store solutions (test failures for us),
+                // shared by all clients
+                OnDiskCorpus::new(artifacts_path.clone()).unwrap(),
+                &mut feedback,
+                &mut objective,
+            )
+            .unwrap()
+        });
+
+        // A queue policy to get testcases from the corpus
+        let scheduler = QueueScheduler::new();
+
+        // A fuzzer with feedbacks and a corpus scheduler
+        let mut fuzzer = StdFuzzer::new(scheduler, feedback, objective);
+
+        // The executor which runs the harness
+        let mut harness_binding = harness;
+        let mut executor = InProcessExecutor::with_timeout(
+            &mut harness_binding,
+            tuple_list!(observer),
+            &mut fuzzer,
+            &mut state,
+            &mut mgr,
+            Duration::MAX,
+        )?;
+
+        // Resume from the corpus of previous campaigns and import the seeds. Inputs that are not
+        // interesting to this client are dropped, failing ones are added to the solutions.
+        if state.corpus().count() == 0 {
+            let in_dirs: Vec<PathBuf> = [&corpus_path, &seeds_path]
+                .into_iter()
+                .filter(|dir| dir.is_dir())
+                .cloned()
+                .collect();
+            state.load_initial_inputs(&mut fuzzer, &mut executor, &mut mgr, &in_dirs)?;
+        }
+
+        // Otherwise, initialize the corpus with a single byte array that will be mutated
+        // repeatedly. Testcases found by the other clients are added as they arrive.
+        if state.corpus().count() == 0 {
+            state
+                .corpus_mut()
+                .add(Testcase::new(BytesInput::new(vec![0u8; 1024])))?;
+        }
+
+        // Setup a mutational stage with a basic bytes mutator
+        let mutator = HavocScheduledMutator::new(havoc_mutations());
+        let mut stages = tuple_list!(StdMutationalStage::with_max_iterations(
+            mutator,
+            nonzero!(1)
+        ));
+
+        if let Some(iterations) = iterations {
+            fuzzer.fuzz_loop_for(&mut stages, &mut executor, &mut state, &mut mgr, iterations)?;
+            // Tell the restarter that the client is done, so that it is not respawned
+            mgr.send_exiting()?;
+        } else {
+            fuzzer.fuzz_loop(&mut stages, &mut executor, &mut state, &mut mgr)?;
+        }
+        Ok(())
+    };
+
+    // The Monitor trait defines how the fuzzer stats are displayed to the user.
+    // Stats, e.g. execs/sec, are reported for each client and aggregated over all of them.
+    let monitor = MultiMonitor::new(|s| println!("{s}"));
+
+    // The launcher forks a client for each core, and runs the LLMP broker that passes new
+    // testcases and findings between them in this process
+    let shmem_provider = StdShMemProvider::new().expect("Failed to init shared memory");
+    match Launcher::builder()
+        .shmem_provider(shmem_provider)
+        .configuration(EventConfig::from_name("skribe-fuzz"))
+        .monitor(monitor)
+        .run_client(&mut run_client)
+        .cores(&cores)
+        .broker_port(broker_port)
+        .build()
+        .launch()
+    {
+        Ok(()) | Err(Error::ShuttingDown) => (),
+        Err(err) => panic!("Failed to run the launcher: {err:?}"),
     }
 }
 
@@ -170,8 +238,7 @@ fn harness(data: &BytesInput) -> ExitKind {
     let config = config_cell.as_ref().unwrap();
 
     // Marshal over to kllvm with the CALLDATA variable substituted
-    let mut u = Unstructured::new(data.as_ref());
-    let input = config.abi.arbitrary_input(&mut u).unwrap();
+    let input = config.abi.input_from_bytes(data.as_ref()).unwrap();
     let coverage = config.coverage;
     let sig = SignatureFuzzer { input, coverage };
     marshaller.set_handler(sig);
@@ -202,3 +269,51 @@ fn harness(data: &BytesInput) -> ExitKind {
         ExitKind::Ok
     }
 }
+
+/// Reduce the corpus in `corpus_path` to the smallest inputs that preserve its coverage map.
+///
+/// Inputs are run from the smallest to the largest, and an input is kept if it covers an entry of
+/// the map that no smaller input covers. The other inputs are removed.
+fn minimize_corpus(corpus_path: &Path) {
+    let mut inputs: Vec<(PathBuf, Vec<u8>)> = std::fs::read_dir(corpus_path)
+        .unwrap()
+        .map(|entry| entry.unwrap().path())
+        // Skip the metadata and lock files of the corpus
+        .filter(|path| {
+            path.is_file() && !path.file_name().unwrap().to_string_lossy().starts_with('.')
+        })
+        .map(|path| {
+            let data = std::fs::read(&path).unwrap();
+            (path, data)
+        })
+        .collect();
+    inputs.sort_by(|(a_path, a), (b_path, b)| (a.len(), a_path).cmp(&(b.len(), b_path)));
+
+    let signals: &mut [u8] = unsafe { std::slice::from_raw_parts_mut(SIGNALS_PTR, SIGNALS_LEN) };
+    let mut covered = vec![false; signals.len()];
+    let mut kept = 0;
+    for (path, data) in &inputs {
+        signals.fill(0);
+        harness(&BytesInput::new(data.clone()));
+
+        let mut new_coverage = false;
+        for (entry, &signal) in covered.iter_mut().zip(signals.iter()) {
+            if signal != 0 && !*entry {
+                *entry = true;
+                new_coverage = true;
+            }
+        }
+
+        if new_coverage {
+            kept += 1;
+        } else {
+            std::fs::remove_file(path).unwrap();
+        }
+    }
+
+    println!(
+        "Kept {kept} of {} inputs, covering {} map entries",
+        inputs.len(),
+        covered.iter().filter(|&&entry| entry).count()
+    );
+}
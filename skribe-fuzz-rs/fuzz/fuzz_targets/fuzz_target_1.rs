@@ -1,16 +1,15 @@
 #![no_main]
 use std::cell::Cell;
+use std::path::{Path, PathBuf};
 
-use arbitrary::Unstructured;
 use libfuzzer_sys::fuzz_target;
 
 use pico_args::Arguments;
 
 use skribe_fuzz_rs::{
-    FuzzConfig, SignatureAbi, SignatureFuzzer, extract_template_and_signature,
-    fuzz_specs_from_json, get_exit_code,
+    FuzzConfig, SignatureAbi, SignatureFuzzer, get_exit_code,
     kllvm::{self, Marshaller},
-    kore,
+    kore, load_template_and_signature, print_calldata,
 };
 
 // Persistent data across iterations.
@@ -41,17 +40,26 @@ fuzz_target!( init: {
         .value_from_str("--function-name")
         .unwrap();
     let coverage: bool = args.contains("--coverage");
+    // Print the calldata of a fuzzer input, e.g. a crash artifact, instead of fuzzing
+    let calldata_input: Option<PathBuf> = args
+        .opt_value_from_str("--calldata")
+        .unwrap();
 
-    // Parse fuzz spec
-    let contents = std::fs::read_to_string(fuzz_spec_file).unwrap();
-    let specs = fuzz_specs_from_json(&contents).unwrap();
-    let (template_str, signature) = extract_template_and_signature(specs, &contract_name, &function_name).unwrap();
+    // Load the fuzz spec of the test function, either JSON or binary
+    let (template_str, signature) =
+        load_template_and_signature(Path::new(&fuzz_spec_file), &contract_name, &function_name)
+            .unwrap();
 
     let mut parser = kore::Parser::new(&template_str).unwrap();
     let template = parser.pattern().unwrap();
 
     let abi = SignatureAbi::from_signature(signature).unwrap();
 
+    if let Some(input_path) = calldata_input {
+        print_calldata(&abi, &input_path);
+        std::process::exit(0);
+    }
+
     FUZZ_CONFIG.replace(Some(FuzzConfig {
         template,
         abi,
@@ -65,8 +73,7 @@ fuzz_target!( init: {
         let config = config_cell.as_ref().unwrap();
 
         // Marshal over to kllvm with the CALLDATA variable substituted
-        let mut u = Unstructured::new(data);
-        let input = config.abi.arbitrary_input(&mut u).unwrap();
+        let input = config.abi.input_from_bytes(data).unwrap();
         let coverage = config.coverage;
         let sig = SignatureFuzzer{ input, coverage };
         marshaller.set_handler(sig);
@@ -83,10 +90,11 @@ fuzz_target!( init: {
 
         // Check the exit code
         let exit_code = get_exit_code(&pattern);
-        if exit_code != 0 {
-            println!("panic!");
-        }
-
         FUZZ_CONFIG.replace(config_cell);
         MARSHALLER.replace(marshaller_cell);
+
+        // Panic on test failures, so that libFuzzer stops and writes the input as a crash artifact
+        if exit_code != 0 {
+            panic!("Test failed with exit code {exit_code}");
+        }
 });
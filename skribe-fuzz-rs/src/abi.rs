@@ -42,6 +42,24 @@ impl SignatureAbi {
             .map_err(|_| arbitrary::Error::IncorrectFormat)
     }
 
+    /// Calldata for a fuzzer input.
+    ///
+    /// Inputs that are already valid calldata for the function, e.g. seeds exported by the
+    /// Python runner, are used as is. Other inputs are decoded with `arbitrary_input`.
+    pub fn input_from_bytes(&self, data: &[u8]) -> arbitrary::Result<Vec<u8>> {
+        if self.is_calldata(data) {
+            return Ok(data.to_vec());
+        }
+        self.arbitrary_input(&mut Unstructured::new(data))
+    }
+
+    fn is_calldata(&self, data: &[u8]) -> bool {
+        match data.strip_prefix(self.function.selector().as_slice()) {
+            Some(args) => self.function.abi_decode_input(args).is_ok(),
+            None => false,
+        }
+    }
+
     fn encode_input(&self, values: &[DynSolValue]) -> Result<Vec<u8>, String> {
         self.function
             .abi_encode_input(values)
@@ -141,6 +159,41 @@ mod tests {
         assert!(result.is_ok());
     }
 
+    #[test]
+    fn test_input_from_calldata() {
+        // Given
+        let abi = signature_abi();
+        let values = vec![
+            DynSolValue::FixedBytes(B256::ZERO, 8),
+            DynSolValue::FixedBytes(B256::ZERO, 8),
+            DynSolValue::Bool(true),
+            DynSolValue::Array(vec![]),
+        ];
+        let calldata = abi.encode_input(&values).unwrap();
+
+        // When
+        let actual = abi.input_from_bytes(&calldata).unwrap();
+
+        // Then
+        assert_eq!(actual, calldata);
+    }
+
+    #[test]
+    fn test_input_from_arbitrary_bytes() {
+        // Given
+        let abi = signature_abi();
+        let raw = vec![0u8; 256];
+
+        // When
+        let actual = abi.input_from_bytes(&raw).unwrap();
+
+        // Then
+        assert_eq!(
+            actual,
+            abi.arbitrary_input(&mut Unstructured::new(&raw)).unwrap()
+        );
+    }
+
     fn signature_abi() -> SignatureAbi {
         SignatureAbi::from_signature(signature()).unwrap()
     }
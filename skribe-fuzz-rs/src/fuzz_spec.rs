@@ -1,5 +1,24 @@
+use std::fs::File;
+use std::io::Read;
+use std::path::Path;
+
+use flate2::read::ZlibDecoder;
+use memmap2::Mmap;
 use serde::Deserialize;
 
+// Binary spec format written by `skribe export-specs --binary`, see `skribe.spec_file`.
+//
+//   magic      8 bytes  SPEC_FILE_MAGIC
+//   version    u32 LE   SPEC_FILE_VERSION
+//   flags      u32 LE   FLAG_ZLIB if the templates are zlib-compressed
+//   index_len  u64 LE   length of the index in bytes
+//   index      JSON     [{"signatures": [...], "offset": int, "size": int}, ...]
+//   data       bytes    templates as KORE text, each at `offset` relative to the start of this section
+const SPEC_FILE_MAGIC: &[u8; 8] = b"SKRBSPEC";
+const SPEC_FILE_VERSION: u32 = 1;
+const FLAG_ZLIB: u32 = 1;
+const HEADER_SIZE: usize = 24;
+
 #[derive(Debug, Deserialize)]
 pub struct Signature {
     pub contract_name: String,
@@ -13,6 +32,13 @@ pub struct FuzzSpec {
     pub signatures: Vec<Signature>,
 }
 
+#[derive(Debug, Deserialize)]
+struct IndexEntry {
+    signatures: Vec<Signature>,
+    offset: usize,
+    size: usize,
+}
+
 pub fn fuzz_specs_from_json(json: &str) -> Result<Vec<FuzzSpec>, serde_json::Error> {
     serde_json::from_str(json)
 }
@@ -31,6 +57,87 @@ pub fn extract_template_and_signature(
     })
 }
 
+/// Loads the template and signature of a test function from a JSON or binary spec file.
+///
+/// The file is memory-mapped. For the binary format, only the index and the bytes of the
+/// selected template are read.
+pub fn load_template_and_signature(
+    path: &Path,
+    contract_name: &str,
+    function_name: &str,
+) -> Result<(String, Signature), String> {
+    let file = File::open(path).map_err(|err| format!("{}: {err}", path.display()))?;
+    // SAFETY: the spec file is not expected to be modified while the fuzzer runs
+    let mmap = unsafe { Mmap::map(&file) }.map_err(|err| format!("{}: {err}", path.display()))?;
+    template_and_signature_from_bytes(&mmap, contract_name, function_name)
+}
+
+pub fn template_and_signature_from_bytes(
+    bytes: &[u8],
+    contract_name: &str,
+    function_name: &str,
+) -> Result<(String, Signature), String> {
+    let not_found =
+        || format!("Test function not found in fuzz spec: {contract_name}.{function_name}");
+
+    if !bytes.starts_with(SPEC_FILE_MAGIC) {
+        let json = std::str::from_utf8(bytes).map_err(|err| err.to_string())?;
+        let specs = fuzz_specs_from_json(json).map_err(|err| err.to_string())?;
+        return extract_template_and_signature(specs, contract_name, function_name)
+            .ok_or_else(not_found);
+    }
+
+    let header = bytes
+        .get(..HEADER_SIZE)
+        .ok_or("Truncated spec file header")?;
+    let version = u32::from_le_bytes(header[8..12].try_into().unwrap());
+    let flags = u32::from_le_bytes(header[12..16].try_into().unwrap());
+    let index_len = u64::from_le_bytes(header[16..24].try_into().unwrap()) as usize;
+    if version != SPEC_FILE_VERSION {
+        return Err(format!("Unsupported spec file version: {version}"));
+    }
+
+    let data_start = HEADER_SIZE + index_len;
+    let index_bytes = bytes
+        .get(HEADER_SIZE..data_start)
+        .ok_or("Truncated spec file index")?;
+    let index: Vec<IndexEntry> =
+        serde_json::from_slice(index_bytes).map_err(|err| err.to_string())?;
+
+    let (offset, size, signature) = index
+        .into_iter()
+        .find_map(|entry| {
+            let IndexEntry {
+                signatures,
+                offset,
+                size,
+            } = entry;
+            signatures
+                .into_iter()
+                .find(|sig| sig.contract_name == contract_name && sig.name == function_name)
+                .map(|sig| (offset, size, sig))
+        })
+        .ok_or_else(not_found)?;
+
+    let start = data_start + offset;
+    let blob = bytes
+        .get(start..start + size)
+        .ok_or("Truncated spec file data")?;
+    let template = if flags & FLAG_ZLIB != 0 {
+        let mut template = String::new();
+        ZlibDecoder::new(blob)
+            .read_to_string(&mut template)
+            .map_err(|err| err.to_string())?;
+        template
+    } else {
+        std::str::from_utf8(blob)
+            .map_err(|err| err.to_string())?
+            .to_owned()
+    };
+
+    Ok((template, signature))
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -63,4 +170,56 @@ mod tests {
             ["bytes8", "bytes8", "bool", "(uint256,bool)[]"]
         );
     }
+
+    fn binary_spec(templates: &[(&str, &str)], compress: bool) -> Vec<u8> {
+        use flate2::{Compression, write::ZlibEncoder};
+        use std::io::Write;
+
+        let mut index = vec![];
+        let mut data = vec![];
+        for (template, function_name) in templates {
+            let blob = if compress {
+                let mut encoder = ZlibEncoder::new(vec![], Compression::default());
+                encoder.write_all(template.as_bytes()).unwrap();
+                encoder.finish().unwrap()
+            } else {
+                template.as_bytes().to_vec()
+            };
+            index.push(serde_json::json!({
+                "signatures": [{"contract_name": "TestContract", "name": function_name, "arg_types": ["uint256"]}],
+                "offset": data.len(),
+                "size": blob.len(),
+            }));
+            data.extend(blob);
+        }
+        let index = serde_json::to_vec(&index).unwrap();
+
+        let mut bytes = SPEC_FILE_MAGIC.to_vec();
+        bytes.extend(SPEC_FILE_VERSION.to_le_bytes());
+        bytes.extend((if compress { FLAG_ZLIB } else { 0 }).to_le_bytes());
+        bytes.extend((index.len() as u64).to_le_bytes());
+        bytes.extend(index);
+        bytes.extend(data);
+        bytes
+    }
+
+    #[test]
+    fn test_template_and_signature_from_binary() {
+        let templates = [
+            ("X:SortGeneratedTopCell{}", "test_x"),
+            ("Y:SortGeneratedTopCell{}", "test_y"),
+        ];
+
+        for compress in [false, true] {
+            let bytes = binary_spec(&templates, compress);
+
+            let (template, sig) =
+                template_and_signature_from_bytes(&bytes, "TestContract", "test_y").unwrap();
+            assert_eq!(template, "Y:SortGeneratedTopCell{}");
+            assert_eq!(sig.name, "test_y");
+            assert_eq!(sig.arg_types, ["uint256"]);
+
+            assert!(template_and_signature_from_bytes(&bytes, "TestContract", "test_z").is_err());
+        }
+    }
 }
@@ -4,11 +4,16 @@ mod fuzz_spec;
 
 pub use abi::SignatureAbi;
 pub use fuzz_config::{FuzzConfig, SignatureFuzzer};
-pub use fuzz_spec::{FuzzSpec, Signature, extract_template_and_signature, fuzz_specs_from_json};
+pub use fuzz_spec::{
+    FuzzSpec, Signature, extract_template_and_signature, fuzz_specs_from_json,
+    load_template_and_signature, template_and_signature_from_bytes,
+};
 
 pub use kframework::kore;
 pub use kframework_ffi::kllvm;
 
+use std::path::Path;
+
 /// Get the <exit-code> cell value from a configuration
 pub fn get_exit_code(pattern: &kore::Pattern) -> u32 {
     let exit_code_cell =
@@ -18,18 +23,24 @@ pub fn get_exit_code(pattern: &kore::Pattern) -> u32 {
     exit_code_str.parse().unwrap()
 }
 
+/// Print the calldata that the harnesses execute for the fuzzer input in `input_path`, as hex.
+///
+/// Used by `skribe run --engine` to decode failing inputs into test arguments.
+pub fn print_calldata(abi: &SignatureAbi, input_path: &Path) {
+    let data = std::fs::read(input_path).expect("Failed to read the fuzzer input");
+    let calldata = abi
+        .input_from_bytes(&data)
+        .expect("Failed to decode the fuzzer input");
+    let hex: String = calldata.iter().map(|byte| format!("{byte:02x}")).collect();
+    println!("{hex}");
+}
+
 pub fn write_coverage_data(pattern: &kore::Pattern, coverage: &mut [u8]) {
-    // Update coverage
-    // This should come in as a zeroed byte array every time, as it gets reset
-    // by the observer at the beginning of each execution
+    // The coverage bitmaps of the accounts are laid out one after the other, in account order
     let coverages = extract_coverages(pattern).unwrap();
     let mut base = 0;
     for cov in &coverages {
-        for entry in &cov.entries {
-            for i in entry.offset..entry.offset + entry.length {
-                coverage[base + i] = 0xff;
-            }
-        }
+        coverage[base..base + cov.size].copy_from_slice(&cov.bitmap);
         base += cov.size;
     }
 }
@@ -47,7 +58,8 @@ fn extract_coverages(pattern: &kore::Pattern) -> Result<Vec<Coverage>, String> {
         .iter()
         .map(|(k, v)| Ok((match_coverage_map_key(k)?, match_coverage_map_value(v)?)))
         .collect::<Result<Vec<_>, String>>()?;
-    entries.sort_by(|(a, _), (b, _)| a.cmp(b));
+    // Account ids are non-negative, so this is the numeric order
+    entries.sort_by(|(a, _), (b, _)| (a.len(), a).cmp(&(b.len(), b)));
     Ok(entries
         .into_iter()
         .map(|(_key, coverage)| coverage)
@@ -64,84 +76,26 @@ fn match_coverage_map_value(pattern: &kore::Pattern) -> Result<Coverage, String>
 
 struct Coverage {
     pub size: usize,
-    pub entries: Vec<CovEntry>,
-}
-
-struct CovEntry {
-    pub offset: usize,
-    pub length: usize,
+    pub bitmap: Vec<u8>,
 }
 
 fn match_coverage(pattern: &kore::Pattern) -> Result<Coverage, String> {
     let args = match_symbol(pattern, "Lbl'Hash'coverage")?;
     match args {
-        [size, entries] => {
+        [size, bitmap] => {
             let size = match_int(size)?
                 .parse::<usize>()
                 .map_err(|e| format!("Invalid size: {e}"))?;
-            let entries = match_set(entries)?
-                .iter()
-                .map(|p| match_cov_entry(match_inj(p)?))
-                .collect::<Result<Vec<_>, _>>()?;
-            Ok(Coverage { size, entries })
-        }
-        _ => Err(format!("Expected 2 args for #coverage, got {}", args.len())),
-    }
-}
-
-fn match_cov_entry(pattern: &kore::Pattern) -> Result<CovEntry, String> {
-    let args = match_symbol(pattern, "Lbl'Hash'covEntry")?;
-    match args {
-        [offset, length] => Ok(CovEntry {
-            offset: match_int(offset)?
-                .parse::<usize>()
-                .map_err(|e| format!("Invalid offset: {e}"))?,
-            length: match_int(length)?
-                .parse::<usize>()
-                .map_err(|e| format!("Invalid length: {e}"))?,
-        }),
-        _ => Err(format!("Expected 2 args for #covEntry, got {}", args.len())),
-    }
-}
-
-fn match_set(pattern: &kore::Pattern) -> Result<Vec<&kore::Pattern>, String> {
-    let mut entries = Vec::new();
-    collect_set_entries(pattern, &mut entries)?;
-    Ok(entries)
-}
-
-fn collect_set_entries<'a>(
-    pattern: &'a kore::Pattern,
-    entries: &mut Vec<&'a kore::Pattern>,
-) -> Result<(), String> {
-    match pattern {
-        kore::Pattern::LeftAssoc(kore::App { symbol, args, .. })
-            if symbol.as_str() == "Lbl'Unds'Set'Unds'" =>
-        {
-            for arg in args {
-                collect_set_entries(arg, entries)?;
+            let bitmap = match_bytes(bitmap)?;
+            if bitmap.len() != size {
+                return Err(format!(
+                    "Expected coverage bitmap of size {size}, got {}",
+                    bitmap.len()
+                ));
             }
-            Ok(())
+            Ok(Coverage { size, bitmap })
         }
-        kore::Pattern::App(kore::App { symbol, args, .. })
-            if symbol.as_str() == "Lbl'Unds'Set'Unds'" =>
-        {
-            for arg in args {
-                collect_set_entries(arg, entries)?;
-            }
-            Ok(())
-        }
-        kore::Pattern::App(kore::App { symbol, .. }) if symbol.as_str() == "Lbl'Stop'Set" => Ok(()),
-        kore::Pattern::App(kore::App { symbol, args, .. }) if symbol.as_str() == "LblSetItem" => {
-            match args.as_slice() {
-                [elem] => {
-                    entries.push(elem);
-                    Ok(())
-                }
-                _ => Err(format!("Expected 1 arg in SetItem, got {}", args.len())),
-            }
-        }
-        _ => Err(format!("Expected set pattern, got {:?}", pattern)),
+        _ => Err(format!("Expected 2 args for #coverage, got {}", args.len())),
     }
 }
 
@@ -238,3 +192,11 @@ fn match_dv<'a>(pattern: &'a kore::Pattern, sort: &str) -> Result<&'a str, Strin
 fn match_int(pattern: &kore::Pattern) -> Result<&str, String> {
     match_dv(pattern, "SortInt")
 }
+
+fn match_bytes(pattern: &kore::Pattern) -> Result<Vec<u8>, String> {
+    // Each byte is a character of the domain value, see `SignatureFuzzer`
+    match_dv(pattern, "SortBytes")?
+        .chars()
+        .map(|c| u8::try_from(c).map_err(|_| format!("Invalid byte in Bytes value: {c:?}")))
+        .collect()
+}
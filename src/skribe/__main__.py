@@ -8,11 +8,13 @@ from pathlib import Path
 from pyk.cli.utils import ensure_dir_path, file_path
 from rich.console import Console
 
-from .skribe import InitializationError, Skribe
+from .native import ENGINES
+from .profiler import PROFILER
+from .skribe import FuzzSpec, InitializationError, Skribe
 from .utils import RECURSION_LIMIT, concrete_definition
 
 
-def _exec_build(dir_path: Path | None) -> None:
+def _exec_build(dir_path: Path | None, force: bool) -> None:
     """
     Builds the contract located in the specified directory.
 
@@ -21,6 +23,7 @@ def _exec_build(dir_path: Path | None) -> None:
     Args:
         dir_path (Path | None): Path to the directory containing the contract source.
                                 If None, defaults to the current working directory.
+        force (bool): Whether to build the contract even if it is unchanged since its last build.
 
     Returns:
         None
@@ -29,12 +32,12 @@ def _exec_build(dir_path: Path | None) -> None:
 
     skribe = Skribe(concrete_definition, dir_path)
 
-    skribe.build_contract()
+    skribe.build_contract(force=force)
 
     exit(0)
 
 
-def _exec_export_specs(dir_path: Path | None) -> None:
+def _exec_export_specs(dir_path: Path | None, output: Path | None, binary: bool, compress: bool, jobs: int) -> None:
     """
     Exports the fuzzer specifications for the contracts located in the specified directory.
 
@@ -43,14 +46,48 @@ def _exec_export_specs(dir_path: Path | None) -> None:
     Args:
         dir_path (Path | None): Path to the directory containing the contract sources.
                                 If None, defaults to the current working directory.
+        output (Path | None): Path to write the specifications to. If None, they are written to stdout.
+        binary (bool): Whether to write the binary spec format instead of JSON.
+        compress (bool): Whether to compress the templates in the binary spec format.
+        jobs (int): Number of worker processes to deploy the test contracts on in parallel.
 
     Returns:
         None
     """
     dir_path = Path.cwd() if dir_path is None else dir_path
     skribe = Skribe(concrete_definition, dir_path)
-    specs = skribe.init_specs()
-    print(json.dumps([spec.dict for spec in specs]))
+    specs = skribe.init_specs(jobs=jobs)
+
+    if binary:
+        data = FuzzSpec.dump_binary(specs, compress=compress)
+    else:
+        data = (json.dumps([spec.dict for spec in specs]) + '\n').encode()
+
+    if output is None:
+        sys.stdout.buffer.write(data)
+    else:
+        output.write_bytes(data)
+    exit(0)
+
+
+def _exec_clean(dir_path: Path | None, user_cache: bool) -> None:
+    """
+    Removes the caches of the contracts located in the specified directory: the deployed test templates, build
+    fingerprints, cargo outputs, stored examples and fuzz workspace.
+
+    If `dir_path` is None, the cache of the current working directory (CWD) is removed.
+
+    Args:
+        dir_path (Path | None): Path to the directory containing the contract sources.
+                                If None, defaults to the current working directory.
+        user_cache (bool): Whether to also remove the cache shared between projects, in `$XDG_CACHE_HOME/skribe`.
+
+    Returns:
+        None
+    """
+    dir_path = Path.cwd() if dir_path is None else dir_path
+    skribe = Skribe(concrete_definition, dir_path)
+    skribe.clean_cache(user_cache=user_cache)
     exit(0)
 
 
@@ -61,6 +98,14 @@ def _exec_run(
     deadline: int | None,
     coverage_enabled: bool | None,
     fuzz_spec_file: Path | None,
+    jobs: int,
+    in_process: bool,
+    batch_size: int,
+    profile_file: Path | None,
+    fuzz_workspace: Path | None,
+    engine: str,
+    replay: bool,
+    time_budget: float | None,
 ) -> None:
     """
     Executes fuzz tests for the Skribe test contract located at the given path.
@@ -76,6 +121,16 @@ def _exec_run(
         deadline: Fuzzer iteration deadline in milliseconds, or ``None`` for no dealine.
         coverage_enabled: Whether coverage tracking is enabled.
         fuzz_spec_file: Path to fuzzer spec file, or ``None`` for computing the spec on-the-fly.
+        jobs: Number of worker processes to fuzz test functions on in parallel, or of cores per test with `libafl`.
+        in_process: Whether to execute examples in-process instead of spawning the interpreter for each.
+        batch_size: Maximum number of calldatas to execute in a single interpreter run.
+        profile_file: Path to write the profile of the run to, or ``None`` for not profiling.
+        fuzz_workspace: `skribe-fuzz` workspace to export seed inputs to, or ``None`` for not exporting seeds.
+            The native engines fuzz in this workspace, by default in the project cache.
+        engine: Fuzzing engine, `hypothesis` or one of the native harnesses `libafl` and `libfuzzer`.
+        replay: Whether to only re-execute the examples stored by previous runs instead of generating new ones.
+        time_budget: Wall-clock time in seconds to share between the tests instead of running `max_examples` each,
+            or ``None``.
 
     Returns:
         None
@@ -86,6 +141,9 @@ def _exec_run(
 
     skribe = Skribe(concrete_definition, dir_path)
 
+    if profile_file is not None:
+        PROFILER.enable()
+
     try:
         failed = skribe.deploy_and_run(
             id=id,
@@ -93,10 +151,21 @@ def _exec_run(
             deadline=deadline,
             coverage_enabled=coverage_enabled,
             fuzz_spec_file=fuzz_spec_file,
+            jobs=jobs,
+            in_process=in_process,
+            batch_size=batch_size,
+            fuzz_workspace=fuzz_workspace,
+            engine=engine,
+            replay=replay,
+            time_budget=time_budget,
         )
     except InitializationError:
         err_console.print('[bold red]Initialization failed[/bold red]')
         exit(1)
+    finally:
+        if profile_file is not None:
+            PROFILER.print_table(err_console)
+            PROFILER.write_json(profile_file)
 
     if not failed:
         exit(0)
@@ -121,6 +190,28 @@ def _argument_parser() -> ArgumentParser:
 
         return n or None  # handle --deadline=0 as "no deadline"
 
+    def positive_int(s: str) -> int:
+        try:
+            n = int(s)
+        except ValueError as err:
+            raise ArgumentTypeError(f'Value is not an integer: {s!r}') from err
+
+        if n <= 0:
+            raise ArgumentTypeError(f'Value is not positive: {s!r}')
+
+        return n
+
+    def positive_float(s: str) -> float:
+        try:
+            x = float(s)
+        except ValueError as err:
+            raise ArgumentTypeError(f'Value is not a number: {s!r}') from err
+
+        if x <= 0:
+            raise ArgumentTypeError(f'Value is not positive: {s!r}')
+
+        return x
+
     parser = ArgumentParser(prog='skribe')
     parser.add_argument(
         '--directory',
@@ -132,8 +223,43 @@ def _argument_parser() -> ArgumentParser:
 
     command_parser = parser.add_subparsers(dest='command', required=True)
 
-    command_parser.add_parser('build', help='build the test contract')
-    command_parser.add_parser('export-specs', help='print the fuzzer specifications')
+    build_parser = command_parser.add_parser('build', help='build the test contract')
+    build_parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Build even if the sources, manifests, lockfiles and toolchain are unchanged since the last build.',
+    )
+    export_specs_parser = command_parser.add_parser('export-specs', help='print the fuzzer specifications')
+    export_specs_parser.add_argument(
+        '--output',
+        '-o',
+        type=Path,
+        default=None,
+        help='File to write the specifications to (default: stdout).',
+    )
+    export_specs_parser.add_argument(
+        '--binary',
+        action='store_true',
+        help='Write the binary spec format, which is memory-mapped and loaded lazily by the fuzzers (default: JSON).',
+    )
+    export_specs_parser.add_argument(
+        '--compress',
+        action='store_true',
+        help='Compress the templates with zlib (requires --binary).',
+    )
+    export_specs_parser.add_argument(
+        '--jobs',
+        '-j',
+        type=positive_int,
+        default=1,
+        help='Number of test contracts to deploy in parallel worker processes (default: 1).',
+    )
+    clean_parser = command_parser.add_parser('clean', help='remove the cached builds, test templates and examples')
+    clean_parser.add_argument(
+        '--user-cache',
+        action='store_true',
+        help='Also remove the cache shared between projects, in $XDG_CACHE_HOME/skribe.',
+    )
 
     run_parser = command_parser.add_parser('run', help='run tests with fuzzing')
     run_parser.add_argument(
@@ -142,6 +268,17 @@ def _argument_parser() -> ArgumentParser:
     run_parser.add_argument(
         '--max-examples', type=int, default=100, help='Maximum number of fuzzing inputs to generate (default: 100).'
     )
+    run_parser.add_argument(
+        '--time-budget',
+        type=positive_float,
+        default=None,
+        metavar='SECONDS',
+        help=(
+            'Share SECONDS of wall-clock time between the tests instead of running --max-examples for each. '
+            'Tests that stop covering new code yield time to the others. Requires --coverage and --batch-size '
+            'above 1, which measure coverage growth (default: no budget).'
+        ),
+    )
     run_parser.add_argument(
         '--deadline',
         type=deadline,
@@ -154,6 +291,64 @@ def _argument_parser() -> ArgumentParser:
         default=None,
         help='Path to fuzzer specification file (default: None).',
     )
+    run_parser.add_argument(
+        '--jobs',
+        '-j',
+        type=positive_int,
+        default=1,
+        help=(
+            'Number of test functions to fuzz in parallel worker processes, '
+            'or of cores to fuzz each test function on with --engine libafl (default: 1).'
+        ),
+    )
+    run_parser.add_argument(
+        '--batch-size',
+        type=positive_int,
+        default=1,
+        help=(
+            'Maximum number of inputs to execute in a single interpreter run. '
+            'Each example is a batch of up to this many inputs (default: 1).'
+        ),
+    )
+    run_parser.add_argument(
+        '--profile',
+        type=Path,
+        nargs='?',
+        const=Path('skribe-profile.json'),
+        default=None,
+        metavar='FILE',
+        help=(
+            'Report the time spent in each phase of the run per test, '
+            'and write it as JSON to FILE (default: skribe-profile.json).'
+        ),
+    )
+    run_parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='hypothesis',
+        help=(
+            'Fuzzing engine. libafl and libfuzzer run the skribe-fuzz and skribe-fuzz-libfuzzer harnesses, '
+            'which have to be on the path (default: hypothesis).'
+        ),
+    )
+    run_parser.add_argument(
+        '--replay',
+        action='store_true',
+        help=(
+            'Only re-execute the failing and interesting examples that previous runs stored '
+            'in the .skribe/examples directory, without generating new ones.'
+        ),
+    )
+    run_parser.add_argument(
+        '--fuzz-workspace',
+        type=Path,
+        default=None,
+        metavar='DIR',
+        help=(
+            'Export the inputs of failing examples, and with --coverage of batches that cover new code, '
+            'as seeds to the skribe-fuzz workspace DIR (default: not exported).'
+        ),
+    )
     run_parser.add_argument(
         '--coverage', dest='coverage', action='store_true', help='Enable coverage tracking (default: disabled).'
     )
@@ -161,6 +356,14 @@ def _argument_parser() -> ArgumentParser:
         '--no-coverage', dest='coverage', action='store_false', help='Disable coverage tracking (default).'
     )
     run_parser.set_defaults(coverage=False)
+    run_parser.add_argument(
+        '--in-process',
+        action='store_true',
+        help=(
+            'Execute examples in-process through the LLVM backend Python bindings instead of spawning the '
+            'interpreter for each example (requires the stylus-semantics.llvm-python target).'
+        ),
+    )
 
     return parser
 
@@ -173,6 +376,22 @@ def main() -> None:
 
     match args.command:
         case 'run':
+            # Reject invalid combinations before the contracts are deployed
+            if args.in_process and args.batch_size > 1:
+                parser.error('--in-process cannot be combined with --batch-size above 1')
+            if args.engine != 'hypothesis' and (
+                args.in_process or args.batch_size > 1 or args.replay or args.time_budget is not None
+            ):
+                parser.error(
+                    f'--in-process, --batch-size, --replay and --time-budget are not supported by {args.engine}'
+                )
+            if args.time_budget is not None:
+                if args.jobs > 1 or args.replay:
+                    parser.error('--time-budget cannot be combined with --jobs or --replay')
+                if not args.coverage or args.batch_size == 1:
+                    parser.error(
+                        '--time-budget requires --coverage and --batch-size above 1 to measure coverage growth'
+                    )
             _exec_run(
                 dir_path=args.directory,
                 id=args.id,
@@ -180,10 +399,28 @@ def main() -> None:
                 deadline=args.deadline,
                 coverage_enabled=args.coverage,
                 fuzz_spec_file=args.fuzz_spec,
+                jobs=args.jobs,
+                in_process=args.in_process,
+                batch_size=args.batch_size,
+                profile_file=args.profile,
+                fuzz_workspace=args.fuzz_workspace,
+                engine=args.engine,
+                replay=args.replay,
+                time_budget=args.time_budget,
             )
         case 'build':
-            _exec_build(dir_path=args.directory)
+            _exec_build(dir_path=args.directory, force=args.force)
         case 'export-specs':
-            _exec_export_specs(dir_path=args.directory)
+            if args.compress and not args.binary:
+                parser.error('--compress requires --binary')
+            _exec_export_specs(
+                dir_path=args.directory,
+                output=args.output,
+                binary=args.binary,
+                compress=args.compress,
+                jobs=args.jobs,
+            )
+        case 'clean':
+            _exec_clean(dir_path=args.directory, user_cache=args.user_cache)
 
     raise RuntimeError(f'Command not implemented: {args.command}')
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from rich.table import Table
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Final
+
+    from rich.console import Console
+
+
+# Maximum number of examples of the first slice of each test, which measures its latency
+PROBE_EXAMPLES: Final = 10
+
+# Lower bound on the duration of a slice in seconds, so that the setup of a slice does not dominate it
+MIN_SLICE: Final = 1.0
+
+
+class Slice(NamedTuple):
+    test: str
+    max_examples: int
+
+
+class BudgetShare:
+    """How much of the budget a test has spent, and what it got for it."""
+
+    test: str
+    examples: int
+    elapsed: float
+    slices: int
+    covered: int
+    gain_rate: float
+    failed: bool
+    exhausted: bool
+
+    def __init__(self, test: str):
+        self.test = test
+        self.examples = 0
+        self.elapsed = 0.0
+        self.slices = 0
+        self.covered = 0
+        self.gain_rate = 0.0
+        self.failed = False
+        self.exhausted = False
+
+    @property
+    def latency(self) -> float | None:
+        """Mean duration of an example in seconds, ``None`` before the first example."""
+        return self.elapsed / self.examples if self.examples else None
+
+    @property
+    def done(self) -> bool:
+        return self.failed or self.exhausted
+
+    @property
+    def saturated(self) -> bool:
+        """Whether the last slice of the test did not cover new code."""
+        return self.slices > 0 and self.gain_rate == 0
+
+
+class TimeBudget:
+    """Allocates a wall-clock budget in seconds across tests, one slice of examples at a time.
+
+    Each test is first probed with up to `PROBE_EXAMPLES` examples to measure its latency. Probes are charged to the
+    budget like any other slice. Once the latency of a test is known, later probes are shortened to the examples that
+    fit into an equal share of the remaining budget, so that probing many tests does not overrun it. Tests that are not
+    probed before the budget is spent are not run.
+
+    Afterwards, the next slice goes to the test that gained the most coverage per second in its last slice, so tests
+    that still find new code get more time. Among saturated tests, and if coverage is not tracked, the test that has
+    spent the least time is next, so time rather than examples is shared equally, and cheap tests yield to expensive
+    ones.
+
+    A slice lasts for a share of the remaining budget, and is converted to a number of examples with the latency of
+    the test. Tests that failed, or ran fewer examples than requested because their inputs were exhausted, are not
+    scheduled again.
+    """
+
+    budget: float
+    tests: dict[str, BudgetShare]
+
+    def __init__(self, tests: Iterable[str], budget: float):
+        self.budget = budget
+        self.tests = {test: BudgetShare(test) for test in tests}
+
+    @property
+    def spent(self) -> float:
+        return sum(test.elapsed for test in self.tests.values())
+
+    @property
+    def remaining(self) -> float:
+        return max(self.budget - self.spent, 0.0)
+
+    def next_slice(self) -> Slice | None:
+        """The next slice to run, or ``None`` if the budget is spent or all tests are done."""
+        active = [test for test in self.tests.values() if not test.done]
+        if not active or self.remaining == 0:
+            return None
+
+        unprobed = [test for test in active if test.slices == 0]
+        if unprobed:
+            return Slice(unprobed[0].test, self._probe_examples(len(unprobed)))
+
+        test = max(active, key=lambda test: (test.gain_rate, -test.elapsed))
+        duration = max(self.remaining / (2 * len(active)), min(MIN_SLICE, self.remaining))
+        latency = test.latency
+        assert latency is not None
+        return Slice(test.test, max(int(duration / latency), 1))
+
+    def _probe_examples(self, unprobed: int) -> int:
+        # Estimate the latency of unprobed tests by the mean latency of the examples run so far
+        examples = sum(test.examples for test in self.tests.values())
+        if not examples:
+            return PROBE_EXAMPLES
+        latency = self.spent / examples
+        return min(max(int(self.remaining / (unprobed * latency)), 1), PROBE_EXAMPLES) if latency else PROBE_EXAMPLES
+
+    def record(
+        self,
+        test: str,
+        examples: int,
+        elapsed: float,
+        covered: int,
+        failed: bool = False,
+        exhausted: bool = False,
+    ) -> None:
+        """Record a slice of `test` that ran `examples` examples in `elapsed` seconds.
+
+        Args:
+            test: The test of the slice.
+            examples: The number of examples the slice ran.
+            elapsed: The duration of the slice in seconds.
+            covered: The number of bytes of contract code covered by all slices of the test so far.
+            failed: Whether the test failed.
+            exhausted: Whether the test ran out of examples.
+        """
+        test_budget = self.tests[test]
+        test_budget.gain_rate = (covered - test_budget.covered) / elapsed if elapsed > 0 else 0.0
+        test_budget.examples += examples
+        test_budget.elapsed += elapsed
+        test_budget.slices += 1
+        test_budget.covered = covered
+        test_budget.failed = failed
+        test_budget.exhausted = exhausted
+
+    def print_table(self, console: Console) -> None:
+        table = Table(title='Time budget')
+        table.add_column('Test')
+        for column in ('Slices', 'Examples', 'Time (s)', 'Share', 'Examples/s', 'Covered'):
+            table.add_column(column, justify='right')
+        table.add_column('Status')
+
+        spent = self.spent
+        for test in self.tests.values():
+            if not test.slices:
+                status = 'Not run'
+            elif test.failed:
+                status = 'Failed'
+            elif test.exhausted:
+                status = 'Exhausted'
+            elif test.saturated:
+                status = 'Saturated'
+            else:
+                status = 'Productive'
+            table.add_row(
+                test.test,
+                str(test.slices),
+                str(test.examples),
+                f'{test.elapsed:.1f}',
+                f'{test.elapsed / spent:.0%}' if spent else '-',
+                f'{test.examples / test.elapsed:.1f}' if test.elapsed else '-',
+                str(test.covered),
+                status,
+            )
+
+        console.print(table)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from kontrol.foundry import Foundry
+from pyk.utils import hash_file, hash_str, run_process
+
+from .cache import FileCache, project_cache_dir
+from .profiler import PROFILER
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Any, Final
+
+
+# Files in the contract directory, besides the sources, that affect the manifest and the ABI
+CARGO_INPUT_FILES: Final = ('Cargo.toml', 'Cargo.lock', 'build.rs', 'rust-toolchain', 'rust-toolchain.toml')
+
+# Files in a Foundry project, besides the sources, that affect the build
+FOUNDRY_INPUT_FILES: Final = ('foundry.toml', 'foundry.lock', 'remappings.txt')
+
+# Directories of a Foundry project that hold build outputs and caches rather than sources
+FOUNDRY_OUTPUT_DIRS: Final = frozenset({'out', 'cache', 'broadcast', '.skribe'})
+
+
+def cargo_cache(contract_path: Path) -> FileCache:
+    """Cache of the outputs of cargo commands for a Stylus contract, kept in its project cache."""
+    return FileCache(project_cache_dir(contract_path) / 'cargo', suffix='.txt')
+
+
+def cargo_fingerprint(cargo_bin: Path, contract_path: Path) -> str:
+    """Digest of the sources, manifest, lockfile and toolchain of a Stylus contract.
+
+    The toolchain includes the version of `cargo stylus`. The sources and manifests of the local packages the contract
+    depends on, i.e. its path and workspace dependencies, are included as well.
+    """
+    toolchain = '\n'.join(
+        run_process([str(cargo_bin), *args], cwd=contract_path, check=True).stdout
+        for args in (['--version', '--verbose'], ['stylus', '--version'])
+    )
+    input_files = _cargo_package_files(contract_path)
+    fingerprint = _fingerprint(contract_path, toolchain, input_files)
+
+    # Dependencies are declared in the files of the contract, so the local packages are resolved once per fingerprint
+    for package_path in _local_dependencies(cargo_bin, contract_path, fingerprint):
+        input_files += _cargo_package_files(package_path)
+    return _fingerprint(contract_path, toolchain, input_files)
+
+
+def _cargo_package_files(package_path: Path) -> list[Path]:
+    input_files = [package_path / file_name for file_name in CARGO_INPUT_FILES]
+    input_files += sorted((package_path / 'src').rglob('*.rs'))
+    return input_files
+
+
+def _local_dependencies(cargo_bin: Path, contract_path: Path, fingerprint: str) -> list[Path]:
+    """Directories of the packages without a registry or git source that the contract depends on, transitively.
+
+    The result is cached under `fingerprint`, the digest of the contract without its dependencies.
+    """
+    cache = cargo_cache(contract_path)
+    key = f'local-dependencies-{fingerprint}'
+    cached = cache.read_text(key)
+    if cached is not None:
+        return [Path(path) for path in json.loads(cached)]
+
+    with PROFILER.phase('cargo'):
+        metadata: dict[str, Any] = json.loads(
+            run_process(
+                [str(cargo_bin), 'metadata', '--format-version', '1'],
+                cwd=contract_path,
+                check=True,
+            ).stdout
+        )
+
+    packages = {package['id']: package for package in metadata['packages']}
+    deps = {node['id']: node['deps'] for node in metadata['resolve']['nodes']}
+    manifest_path = (contract_path / 'Cargo.toml').resolve()
+    root = next(
+        package_id for package_id, package in packages.items() if Path(package['manifest_path']) == manifest_path
+    )
+
+    reachable = {root}
+    pending = [root]
+    while pending:
+        for dep in deps[pending.pop()]:
+            if dep['pkg'] not in reachable:
+                reachable.add(dep['pkg'])
+                pending.append(dep['pkg'])
+
+    res = sorted(
+        str(Path(packages[package_id]['manifest_path']).parent)
+        for package_id in reachable - {root}
+        if packages[package_id]['source'] is None
+    )
+    cache.write_text(key, json.dumps(res))
+    return [Path(path) for path in res]
+
+
+def foundry_fingerprint(project_dir: Path) -> str:
+    """Digest of the Solidity sources, including libraries, configuration, lockfile and `forge` version of a project."""
+    toolchain = run_process(['forge', '--version'], cwd=project_dir, check=True).stdout
+    input_files = [project_dir / file_name for file_name in FOUNDRY_INPUT_FILES]
+    input_files += sorted(
+        path
+        for path in project_dir.rglob('*.sol')
+        if FOUNDRY_OUTPUT_DIRS.isdisjoint(path.relative_to(project_dir).parts[:-1])
+    )
+    return _fingerprint(project_dir, toolchain, input_files)
+
+
+def _fingerprint(project_dir: Path, toolchain: str, input_files: Iterable[Path]) -> str:
+    # Files of local dependencies may be outside of the project
+    digests = {os.path.relpath(path, project_dir): hash_file(path) for path in input_files if path.is_file()}
+    return hash_str(json.dumps({'toolchain': toolchain, 'files': digests}, sort_keys=True))
+
+
+class BuildCache:
+    """The fingerprint of the last build of a project, kept in its project cache.
+
+    `skribe build`, `skribe run` and `skribe-simulation` check the same entry, so a project built by one of them is
+    not rebuilt by the others.
+    """
+
+    _cache: FileCache
+
+    # Key of the entry, which is replaced on each build
+    _KEY: Final = 'last-build'
+
+    def __init__(self, project_dir: Path):
+        self._cache = FileCache(project_cache_dir(project_dir) / 'builds')
+
+    def is_fresh(self, fingerprint: str, outputs: Iterable[Path]) -> bool:
+        """Whether the last build had `fingerprint`, and its `outputs` still exist."""
+        return self._cache.read_text(self._KEY) == fingerprint and all(output.exists() for output in outputs)
+
+    def record(self, fingerprint: str) -> None:
+        self._cache.write_text(self._KEY, fingerprint)
+
+
+def build_foundry(project_dir: Path, force: bool = False) -> bool:
+    """Build a Foundry project, unless it is unchanged since its last build.
+
+    Returns:
+        Whether the project was built.
+    """
+    foundry = Foundry(project_dir)
+    cache = BuildCache(project_dir)
+    fingerprint = foundry_fingerprint(project_dir)
+    if not force and cache.is_fresh(fingerprint, [foundry.out]):
+        return False
+
+    with PROFILER.phase('forge'):
+        foundry.build(True)
+    cache.record(fingerprint)
+    return True
+
+
+def build_foundry_projects(project_dirs: Iterable[Path], force: bool = False) -> None:
+    """Build Foundry projects in parallel, skipping unchanged ones, see `build_foundry`."""
+    unique_dirs = list(dict.fromkeys(project_dir.resolve() for project_dir in project_dirs))
+    if not unique_dirs:
+        return
+
+    with ThreadPoolExecutor(max_workers=len(unique_dirs)) as executor:
+        # Consume the results to raise the first build error
+        list(executor.map(lambda project_dir: build_foundry(project_dir, force=force), unique_dirs))
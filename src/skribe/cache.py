@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+import shutil
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING
+
+from xdg_base_dirs import xdg_cache_home
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Final
+
+
+PROJECT_CACHE_DIR_NAME: Final = '.skribe'
+
+
+def project_cache_dir(project_dir: Path) -> Path:
+    """Directory for the caches Skribe keeps in a test contract project."""
+    return project_dir / PROJECT_CACHE_DIR_NAME
+
+
+class FileCache:
+    """A directory of cache entries, one file per key.
+
+    Keys are expected to be content hashes, so entries are never updated in place. Writes are atomic, which makes
+    the cache safe to share between concurrent Skribe processes.
+    """
+
+    cache_dir: Path
+    suffix: str
+
+    def __init__(self, cache_dir: Path, suffix: str = ''):
+        self.cache_dir = cache_dir
+        self.suffix = suffix
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}{self.suffix}'
+
+    def read_bytes(self, key: str) -> bytes | None:
+        try:
+            return self.path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def read_text(self, key: str) -> str | None:
+        data = self.read_bytes(key)
+        return data.decode() if data is not None else None
+
+    def write_bytes(self, key: str, data: bytes) -> None:
+        self._ensure_cache_dir()
+        with NamedTemporaryFile(dir=self.cache_dir, prefix='.tmp-', delete=False) as f:
+            f.write(data)
+        os.replace(f.name, self.path(key))
+
+    def write_text(self, key: str, text: str) -> None:
+        self.write_bytes(key, text.encode())
+
+    def clean(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _entries(self) -> list[Path]:
+        if not self.cache_dir.is_dir():
+            return []
+        return [path for path in self.cache_dir.iterdir() if path.is_file() and path.name.endswith(self.suffix)]
+
+    def _ensure_cache_dir(self) -> None:
+        if self.cache_dir.is_dir():
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Keep cache directories inside of projects out of version control
+        root = self.cache_dir
+        while root.parent.name and root.name != PROJECT_CACHE_DIR_NAME:
+            root = root.parent
+        if root.name == PROJECT_CACHE_DIR_NAME and not (root / '.gitignore').exists():
+            (root / '.gitignore').write_text('*\n')
+
+
+class LRUFileCache(FileCache):
+    """A `FileCache` whose total size is bounded by `max_bytes`.
+
+    The modification time of an entry is refreshed on each hit. When a write makes the cache exceed its bound,
+    the least recently used entries are removed.
+    """
+
+    max_bytes: int
+
+    def __init__(self, cache_dir: Path, max_bytes: int, suffix: str = ''):
+        super().__init__(cache_dir, suffix=suffix)
+        self.max_bytes = max_bytes
+
+    def read_bytes(self, key: str) -> bytes | None:
+        data = super().read_bytes(key)
+        if data is not None:
+            try:
+                os.utime(self.path(key))
+            except FileNotFoundError:  # evicted by a concurrent process
+                pass
+        return data
+
+    def write_bytes(self, key: str, data: bytes) -> None:
+        super().write_bytes(key, data)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits into `max_bytes`."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def user_cache_dir() -> Path:
+    """Directory for the caches Skribe shares between projects, `$XDG_CACHE_HOME/skribe`."""
+    return xdg_cache_home() / 'skribe'
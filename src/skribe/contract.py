@@ -14,6 +14,9 @@ from kontrol.solc_to_k import contract_name_with_path, method_sig_from_abi
 from pyk.kast.inner import KSort
 from pyk.utils import run_process, single
 
+from .build import cargo_cache, cargo_fingerprint
+from .cache import FileCache
+from .profiler import PROFILER
 from .simulation import call_data
 from .utils import STYLUS_WASM_PREFIX
 
@@ -44,9 +47,9 @@ class StylusContract:
     @cached_property
     def manifest(self) -> dict[str, Any]:
         return json.loads(
-            run_process(
+            self._cargo_output(
+                'metadata',
                 [
-                    str(self._cargo_bin),
                     'metadata',
                     '--no-deps',
                     '--manifest-path',
@@ -54,8 +57,7 @@ class StylusContract:
                     '--format-version',
                     '1',
                 ],
-                check=True,
-            ).stdout
+            )
         )
 
     @cached_property
@@ -68,14 +70,36 @@ class StylusContract:
 
     @cached_property
     def abi(self) -> list[dict[str, Any]]:
-        proc_res = run_process(
-            [str(self._cargo_bin), 'stylus', 'export-abi', '--json'],
-            cwd=self.contract_path,
-            check=True,
-        )
-        json_output = proc_res.stdout.split('\n', 3)[3]  # remove the headers
+        output = self._cargo_output('abi', ['stylus', 'export-abi', '--json'])
+        json_output = output.split('\n', 3)[3]  # remove the headers
         return json.loads(json_output)
 
+    def _cargo_output(self, name: str, args: list[str]) -> str:
+        """Run a cargo command in the contract directory, or return its output from a previous run.
+
+        Only use for commands whose output is determined by the inputs of `fingerprint`.
+        """
+        key = f'{name}-{self.fingerprint}'
+        output = self._cache.read_text(key)
+        if output is None:
+            with PROFILER.phase('cargo'):
+                output = run_process([str(self._cargo_bin), *args], cwd=self.contract_path, check=True).stdout
+            self._cache.write_text(key, output)
+        return output
+
+    def clean_cache(self) -> None:
+        """Remove the cached outputs of cargo commands."""
+        self._cache.clean()
+
+    @cached_property
+    def _cache(self) -> FileCache:
+        return cargo_cache(self.contract_path)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Digest of the inputs of the build, see `cargo_fingerprint`."""
+        return cargo_fingerprint(self._cargo_bin, self.contract_path)
+
     @cached_property
     def methods(self) -> tuple[Method, ...]:
         return tuple(
@@ -96,16 +120,25 @@ class StylusContract:
         )
 
     @cached_property
-    def deployed_bytecode(self) -> bytes:
+    def wasm_path(self) -> Path:
         wasm_file_name = self._name.replace('-', '_') + '.wasm'
-        wasm_path = Path(self.manifest['target_directory']) / 'wasm32-unknown-unknown' / 'release' / wasm_file_name
-        bytecode = wasm_path.read_bytes()
+        return Path(self.manifest['target_directory']) / 'wasm32-unknown-unknown' / 'release' / wasm_file_name
+
+    @cached_property
+    def deployed_bytecode(self) -> bytes:
+        bytecode = self.wasm_path.read_bytes()
         return STYLUS_WASM_PREFIX + bytecode
 
 
 ArbitrumContract: TypeAlias = EVMContract | StylusContract
 
 
+def deployed_bytecode(c: ArbitrumContract) -> bytes:
+    if isinstance(c, StylusContract):
+        return c.deployed_bytecode
+    return bytes.fromhex(c.deployed_bytecode)
+
+
 def setup_method(c: ArbitrumContract) -> Method | None:
     for m in c.methods:
         if m.name == 'setUp':
@@ -54,6 +54,15 @@ def check_foundry_success() -> KInner:
     return KApply('checkFoundrySuccess', [])
 
 
+def call_stylus_batch(from_account: int | None, to_account: int | None, datas: KInner) -> KInner:
+    """Constructs a KApply term for the 'callStylusBatch' operation. `datas` is a K `List` of the calldatas."""
+    return KApply('callStylusBatch', [account(from_account), account(to_account), datas])
+
+
+def cache_stylus_modules() -> KInner:
+    return KApply('cacheStylusModules', [])
+
+
 def check_output(bs: bytes) -> KInner:
     return KApply('checkOutput', [token(bs)])
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import shutil
+import sysconfig
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -8,6 +9,7 @@ from kevm_pyk.kompile import KompileTarget, LLVMKompileType, kevm_kompile
 from kontrol.kdist.utils import KSRC_DIR as FOUNDRY_KSRC_DIR
 from pyk.kbuild.utils import k_version
 from pyk.kdist.api import Target
+from pyk.kllvm.compiler import compile_runtime
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Mapping
@@ -65,6 +67,23 @@ class SkribeTarget(Target):
         return {'k-version': k_version().text}
 
 
+class RuntimeTarget(Target):
+    """Python extension module of the LLVM interpreter for in-process execution via `pyk.kllvm`."""
+
+    def build(self, output_dir: Path, deps: dict[str, Path], args: dict[str, Any], verbose: bool) -> None:
+        ccopts = [ccopt for ccopt in args.get('ccopts', '').split(' ') if ccopt]
+        compile_runtime(deps['stylus-semantics.llvm'], output_dir, ccopts=ccopts, verbose=verbose)
+
+    def deps(self) -> tuple[str, ...]:
+        return ('stylus-semantics.llvm',)
+
+    def context(self) -> dict[str, str]:
+        return {
+            'k-version': k_version().text,
+            'python-extension-suffix': sysconfig.get_config_var('EXT_SUFFIX'),
+        }
+
+
 __TARGETS__: Final = {
     'source': SourceTarget(),
     'llvm': SkribeTarget(
@@ -86,4 +105,5 @@ __TARGETS__: Final = {
             'includes': [src_dir, FOUNDRY_KSRC_DIR],
         },
     ),
+    'llvm-python': RuntimeTarget(),
 }
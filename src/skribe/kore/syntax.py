@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pyk.kore.prelude import (
+    BYTES,
+    INT,
+    LBL_LIST,
+    LBL_LIST_ITEM,
+    LBL_MAP,
+    LBL_MAP_ITEM,
+    SORT_K_ITEM,
+    STOP_LIST,
+    STOP_MAP,
+    bytes_dv,
+    inj,
+    int_dv,
+    k,
+    kseq,
+    str_dv,
+)
+from pyk.kore.syntax import App, LeftAssoc, SortApp
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Final
+
+    from pyk.kore.syntax import Pattern
+
+# Counterparts of the builders in `skribe.kast.syntax` that construct KORE patterns directly. Symbols and sorts are
+# resolved here, so that building a term does not need the definition.
+
+SORT_STEPS: Final = SortApp('SortSteps')
+SORT_ETHEREUM_SIMULATION: Final = SortApp('SortEthereumSimulation')
+SORT_ACCOUNT: Final = SortApp('SortAccount')
+SORT_ACCOUNT_CODE: Final = SortApp('SortAccountCode')
+
+STEPS_TERMINATOR: Final = App("Lbl'Stop'List'LBraQuot'skribeSteps'QuotRBra'")
+LBL_STEPS: Final = 'LblskribeSteps'
+
+NO_ACCOUNT: Final = App("Lbl'Stop'Account")
+
+
+def steps_of(steps: Iterable[Pattern]) -> Pattern:
+    res: Pattern = STEPS_TERMINATOR
+    for step in reversed(list(steps)):
+        res = App(LBL_STEPS, (), (step, res))
+    return res
+
+
+def simulation(steps: Iterable[Pattern]) -> Pattern:
+    """A program of sort `EthereumSimulation`, the sort of `$PGM`."""
+    return inj(SORT_STEPS, SORT_ETHEREUM_SIMULATION, steps_of(steps))
+
+
+def k_cell(steps: Iterable[Pattern]) -> App:
+    return k(kseq([inj(SORT_STEPS, SORT_K_ITEM, steps_of(steps))]))
+
+
+def set_exit_code(i: int) -> Pattern:
+    return App('LblsetExitCode', (), (int_dv(i),))
+
+
+def new_account(id: int) -> Pattern:
+    return App('LblnewAccount', (), (int_dv(id),))
+
+
+def set_balance(id: int, value: int) -> Pattern:
+    return App('LblsetBalance', (), (int_dv(id), int_dv(value)))
+
+
+def set_contract(id: int, code: bytes, storage: Iterable[tuple[int, int]]) -> Pattern:
+    code_pattern = inj(BYTES, SORT_ACCOUNT_CODE, bytes_dv(code))
+    return App('LblsetContract', (), (int_dv(id), code_pattern, storage_map(storage)))
+
+
+def storage_map(storage: Iterable[tuple[int, int]]) -> Pattern:
+    """A K `Map` of storage slots.
+
+    Maps of several slots are built as a single flat `\\left-assoc` application, so that large maps are not deeply
+    nested. The slots are consumed once, into the map items of the application and a set of keys to detect repeated
+    slots.
+
+    Raises:
+        ValueError if a slot occurs more than once
+    """
+    keys: set[int] = set()
+    items: list[Pattern] = []
+    for key, value in storage:
+        if key in keys:
+            raise ValueError(f'Repeated storage slot: {key}')
+        keys.add(key)
+        items.append(App(LBL_MAP_ITEM, (), (inj(INT, SORT_K_ITEM, int_dv(key)), inj(INT, SORT_K_ITEM, int_dv(value)))))
+
+    if not items:
+        return STOP_MAP
+    if len(items) == 1:
+        return items[0]
+    return LeftAssoc(LBL_MAP, args=items)
+
+
+def account(id: int | None) -> Pattern:
+    return inj(INT, SORT_ACCOUNT, int_dv(id)) if id is not None else NO_ACCOUNT
+
+
+def call_stylus(from_account: int | None, to_account: int | None, data: Pattern, value: int) -> Pattern:
+    """Constructs a pattern for the 'callStylus' operation. `data` is a pattern of sort `Bytes` instead of 'bytes' to
+    allow passing a variable when fuzzing.
+    """
+    return App('LblcallStylus', (), (account(from_account), account(to_account), data, int_dv(value)))
+
+
+def check_foundry_success() -> Pattern:
+    return App('LblcheckFoundrySuccess')
+
+
+def call_stylus_batch(from_account: int | None, to_account: int | None, datas: Pattern) -> Pattern:
+    """Constructs a pattern for the 'callStylusBatch' operation. `datas` is a K `List` of the calldatas."""
+    return App('LblcallStylusBatch', (), (account(from_account), account(to_account), datas))
+
+
+def cache_stylus_modules() -> Pattern:
+    return App('LblcacheStylusModules')
+
+
+def check_output(bs: bytes) -> Pattern:
+    return App('LblcheckOutput', (), (bytes_dv(bs),))
+
+
+def bytes_list(datas: Iterable[Pattern]) -> Pattern:
+    """A K `List` of patterns of sort `Bytes`."""
+    res: Pattern | None = None
+    for data in reversed(list(datas)):
+        item = App(LBL_LIST_ITEM, (), (inj(BYTES, SORT_K_ITEM, data),))
+        res = item if res is None else App(LBL_LIST, (), (item, res))
+    return res if res is not None else STOP_LIST
+
+
+def bytes_item(bs: bytes) -> Pattern:
+    """A `Bytes` value as a `KItem`."""
+    return inj(BYTES, SORT_K_ITEM, bytes_dv(bs))
+
+
+def pyk_hook_result(sig: str, result: Pattern) -> Pattern:
+    """Constructs a pattern for `#pykHookResult`. `result` is a pattern of sort `KItem`."""
+    return App("Lblskribe'Stop'pykHookResult", (), (str_dv(sig), result))
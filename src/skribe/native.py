@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+from collections import deque
+from functools import cached_property
+from math import ceil
+from pathlib import Path
+from subprocess import PIPE, STDOUT, Popen
+from typing import TYPE_CHECKING, NamedTuple
+
+from pyk.kdist import kdist
+from pyk.utils import run_process
+
+from .profiler import PROFILER
+
+if TYPE_CHECKING:
+    from typing import Final
+
+    from .contract import Signature
+    from .progress import FuzzTask
+
+
+ENGINES: Final = ('hypothesis', 'libafl', 'libfuzzer')
+
+# Harness executables of the native engines, built from `skribe-fuzz-rs`
+HARNESSES: Final = {
+    'libafl': 'skribe-fuzz',
+    'libfuzzer': 'skribe-fuzz-libfuzzer',
+}
+
+# The harnesses link against the interpreter library of this target
+LIBRARY_TARGET: Final = 'stylus-semantics.llvm-library'
+
+# Global statistics printed by the LibAFL monitor, e.g. `(GLOBAL) run time: ..., executions: 25, exec/sec: 1.234k`
+_LIBAFL_STATS: Final = re.compile(r'\(GLOBAL\).*executions: (?P<execs>\d+), exec/sec: (?P<rate>[\d.]+)(?P<unit>[kM]?)')
+
+# Status lines printed by libFuzzer, e.g. `#128	NEW    cov: 12 ft: 12 corp: 3/7b exec/s: 64 rss: 41Mb`
+_LIBFUZZER_STATS: Final = re.compile(r'^#(?P<execs>\d+)\s.*exec/s: (?P<rate>\d+)(?P<unit>)')
+
+_UNITS: Final = {'': 1, 'k': 1_000, 'M': 1_000_000}
+
+# Lines of harness output to keep for error messages
+_OUTPUT_TAIL: Final = 20
+
+
+class FuzzStats(NamedTuple):
+    executions: int
+    execs_per_sec: float
+
+
+def parse_stats(line: str) -> FuzzStats | None:
+    """Parse a line of LibAFL or libFuzzer output that reports the number of executions and executions per second."""
+    match = _LIBAFL_STATS.search(line) or _LIBFUZZER_STATS.search(line)
+    if match is None:
+        return None
+    execs_per_sec = float(match['rate']) * _UNITS[match['unit']]
+    return FuzzStats(int(match['execs']), execs_per_sec)
+
+
+def fuzz_test_dir(fuzz_workspace: Path, signature: Signature) -> Path:
+    """Directory of a test function in a `skribe-fuzz` workspace, with its `artifacts`, `corpus` and `seeds`."""
+    return fuzz_workspace / signature.contract_name / signature.name
+
+
+class NativeFuzzer:
+    """Fuzzes test functions with a native harness of `skribe-fuzz-rs`, one harness process per test function.
+
+    Campaigns run in the `skribe-fuzz` workspace layout, so they resume from the corpus of previous campaigns and
+    start from the seeds exported by `skribe run --fuzz-workspace`. Failing inputs are read back from the artifacts of
+    the test function, and turned into calldata by the harness.
+    """
+
+    engine: str
+    harness: Path
+    fuzz_workspace: Path
+    cores: int
+
+    def __init__(self, engine: str, fuzz_workspace: Path, cores: int = 1):
+        if engine not in HARNESSES:
+            raise ValueError(f'Not a native fuzzing engine: {engine!r}')
+
+        harness = shutil.which(HARNESSES[engine])
+        if harness is None:
+            raise RuntimeError(
+                f"Couldn't find {HARNESSES[engine]!r} executable. "
+                'Please build it from skribe-fuzz-rs and make sure it is on your path.'
+            )
+
+        self.engine = engine
+        self.harness = Path(harness)
+        self.fuzz_workspace = fuzz_workspace
+        self.cores = cores
+
+    @cached_property
+    def _env(self) -> dict[str, str]:
+        library_dir = str(kdist.get(LIBRARY_TARGET))
+        ld_library_path = os.pathsep.join(
+            path for path in (library_dir, os.environ.get('LD_LIBRARY_PATH')) if path is not None
+        )
+        return {**os.environ, 'KLLVM_LIBRARY_PATH': library_dir, 'LD_LIBRARY_PATH': ld_library_path}
+
+    def run_test(
+        self,
+        spec_file: Path,
+        signature: Signature,
+        max_examples: int,
+        task: FuzzTask,
+        coverage_enabled: bool = False,
+    ) -> bytes | None:
+        """Fuzz the test function of `signature` for up to `max_examples` executions.
+
+        Returns:
+            The calldata of the smallest input that failed in this campaign, or ``None`` if there was none.
+
+        Raises:
+            RuntimeError if the harness fails for any other reason than a failing input
+        """
+        test_dir = fuzz_test_dir(self.fuzz_workspace, signature)
+        artifacts_dir = test_dir / 'artifacts'
+        known_artifacts = set(_inputs(artifacts_dir))
+
+        args = self._spec_args(spec_file, signature)
+        if coverage_enabled:
+            args.append('--coverage')
+
+        if self.engine == 'libafl':
+            iterations = ceil(max_examples / self.cores)
+            cores = f'0-{self.cores - 1}' if self.cores > 1 else '0'
+            args += [f'--workspace={self.fuzz_workspace}', f'--iterations={iterations}', f'--cores={cores}']
+        else:
+            # libFuzzer writes new inputs to the first corpus directory, and only reads the others
+            corpus_dir = test_dir / 'corpus'
+            corpus_dir.mkdir(parents=True, exist_ok=True)
+            artifacts_dir.mkdir(parents=True, exist_ok=True)
+            corpus_dirs = [corpus_dir] + [seeds_dir for seeds_dir in [test_dir / 'seeds'] if seeds_dir.is_dir()]
+            args += [f'-runs={max_examples}', f'-artifact_prefix={artifacts_dir}/', *map(str, corpus_dirs)]
+
+        with PROFILER.phase('harness'):
+            returncode, output = self._run(args, task)
+
+        failing = [path for path in _inputs(artifacts_dir) if path not in known_artifacts]
+        if failing:
+            smallest = min(failing, key=lambda path: (path.stat().st_size, path.name))
+            return self.calldata(spec_file, signature, smallest)
+
+        if returncode != 0:
+            raise RuntimeError(f'{self.harness.name} failed with exit code {returncode}:\n{output}')
+
+        return None
+
+    def calldata(self, spec_file: Path, signature: Signature, input_file: Path) -> bytes:
+        """Calldata that the harness executes for the fuzzer input in `input_file`."""
+        args = [str(self.harness), f'--calldata={input_file}', *self._spec_args(spec_file, signature)]
+        proc_res = run_process(args, env=self._env, check=True)
+        return bytes.fromhex(proc_res.stdout.split()[-1])
+
+    def _spec_args(self, spec_file: Path, signature: Signature) -> list[str]:
+        # libFuzzer takes the options of the harness only with an equals sign
+        return [
+            f'--fuzz-spec={spec_file}',
+            f'--contract-name={signature.contract_name}',
+            f'--function-name={signature.name}',
+        ]
+
+    def _run(self, args: list[str], task: FuzzTask) -> tuple[int, str]:
+        # Run the harness, reporting its statistics to `task` as they are printed.
+        # Returns the exit code and the last lines of output.
+        tail: deque[str] = deque(maxlen=_OUTPUT_TAIL)
+        with Popen([str(self.harness), *args], stdout=PIPE, stderr=STDOUT, text=True, env=self._env) as proc:
+            assert proc.stdout is not None
+            for line in proc.stdout:
+                tail.append(line)
+                stats = parse_stats(line)
+                if stats is not None:
+                    task.report(stats.executions, stats.execs_per_sec)
+        return proc.returncode, ''.join(tail)
+
+
+def _inputs(input_dir: Path) -> list[Path]:
+    # Skip the metadata and lock files LibAFL keeps next to the inputs
+    if not input_dir.is_dir():
+        return []
+    return [path for path in input_dir.iterdir() if path.is_file() and not path.name.startswith('.')]
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager, nullcontext
+from math import ceil
+from time import perf_counter
+from typing import TYPE_CHECKING, NamedTuple, TypeAlias
+
+from rich.table import Table
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from contextlib import AbstractContextManager
+    from pathlib import Path
+    from typing import Any, Final
+
+    from rich.console import Console
+
+
+# Test name -> phase name -> durations in seconds
+ProfileSamples: TypeAlias = dict[str, dict[str, list[float]]]
+
+# Test name for phases outside of fuzzing a test, e.g. building and deploying the contracts
+SETUP: Final = '(setup)'
+
+
+class PhaseStats(NamedTuple):
+    count: int
+    total: float
+    mean: float
+    p50: float
+    p99: float
+
+    @staticmethod
+    def of(durations: Iterable[float]) -> PhaseStats:
+        ordered = sorted(durations)
+        total = sum(ordered)
+        return PhaseStats(
+            count=len(ordered),
+            total=total,
+            mean=total / len(ordered),
+            p50=_percentile(ordered, 50),
+            p99=_percentile(ordered, 99),
+        )
+
+    @property
+    def dict(self) -> dict[str, Any]:
+        return self._asdict()
+
+
+class Profiler:
+    """Collects the durations of the phases of a run, per test.
+
+    All methods are no-ops unless the profiler is enabled, so instrumented code paths don't pay for profiling
+    by default.
+    """
+
+    enabled: bool
+    samples: ProfileSamples
+    _test: str
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.samples = {}
+        self._test = SETUP
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def phase(self, name: str) -> AbstractContextManager[None]:
+        """Time the enclosed block as an occurrence of phase `name` of the current test."""
+        if not self.enabled:
+            return nullcontext()
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start)
+
+    @contextmanager
+    def test(self, name: str) -> Iterator[None]:
+        """Attribute the phases in the enclosed block to test `name`."""
+        prev_test = self._test
+        self._test = name
+        try:
+            yield
+        finally:
+            self._test = prev_test
+
+    def record(self, phase: str, duration: float) -> None:
+        if not self.enabled:
+            return
+        self.samples.setdefault(self._test, {}).setdefault(phase, []).append(duration)
+
+    def take_samples(self) -> ProfileSamples:
+        """Return and clear the samples collected so far, e.g. to send them from a worker process."""
+        samples = self.samples
+        self.samples = {}
+        return samples
+
+    def merge(self, samples: ProfileSamples) -> None:
+        for test, phases in samples.items():
+            for phase, durations in phases.items():
+                self.samples.setdefault(test, {}).setdefault(phase, []).extend(durations)
+
+    def stats(self) -> dict[str, dict[str, PhaseStats]]:
+        return {
+            test: {phase: PhaseStats.of(durations) for phase, durations in sorted(phases.items())}
+            for test, phases in sorted(self.samples.items(), key=lambda item: (item[0] != SETUP, item[0]))
+        }
+
+    def write_json(self, file_path: Path) -> None:
+        dct = {
+            test: {phase: phase_stats.dict for phase, phase_stats in phases.items()}
+            for test, phases in self.stats().items()
+        }
+        file_path.write_text(json.dumps(dct, indent=2) + '\n')
+
+    def print_table(self, console: Console) -> None:
+        table = Table(title='Profile')
+        table.add_column('Test')
+        table.add_column('Phase')
+        for column in ('Count', 'Total (s)', 'Mean (ms)', 'p50 (ms)', 'p99 (ms)'):
+            table.add_column(column, justify='right')
+
+        for test, phases in self.stats().items():
+            for i, (phase, phase_stats) in enumerate(phases.items()):
+                table.add_row(
+                    test if i == 0 else '',
+                    phase,
+                    str(phase_stats.count),
+                    f'{phase_stats.total:.3f}',
+                    f'{phase_stats.mean * 1000:.2f}',
+                    f'{phase_stats.p50 * 1000:.2f}',
+                    f'{phase_stats.p99 * 1000:.2f}',
+                    end_section=i == len(phases) - 1,
+                )
+
+        console.print(table)
+
+
+def _percentile(ordered: list[float], percent: int) -> float:
+    # Nearest-rank method
+    rank = max(ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+# Profiler of the current process, enabled by `skribe run --profile`
+PROFILER: Final = Profiler()
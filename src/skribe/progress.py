@@ -1,21 +1,27 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, TypeAlias
 
 from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
+    from queue import Queue
 
     from rich.progress import TaskID
 
     from .contract import Signature
 
 
+# (index of the task in `FuzzProgress.fuzz_tasks`, name of the `FuzzTask` method to call)
+FuzzEvent: TypeAlias = tuple[int, str]
+
+
 class FuzzProgress(Progress):
     fuzz_tasks: list[FuzzTask]
 
-    def __init__(self, signatures: Iterable[Signature], max_examples: int):
+    def __init__(self, signatures: Iterable[Signature], max_examples: int | None):
         super().__init__(
             TextColumn('[progress.description]{task.description}'),
             BarColumn(),
@@ -32,8 +38,40 @@ class FuzzProgress(Progress):
             task_id = self.add_task(description, total=max_examples, start=False, status='Waiting')
             self.fuzz_tasks.append(FuzzTask(signature, task_id, self))
 
+    def handle_event(self, event: FuzzEvent) -> None:
+        """Apply a progress update sent by a `RemoteFuzzTask` to the corresponding task."""
+        index, action = event
+        task = self.fuzz_tasks[index]
+        match action:
+            case 'start':
+                task.start()
+            case 'end':
+                task.end()
+            case 'advance':
+                task.advance()
+            case 'fail':
+                task.fail()
+            case _:
+                raise ValueError(f'Unknown progress action: {action}')
+
+
+class AbstractFuzzTask(ABC):
+    signature: Signature
+
+    @abstractmethod
+    def start(self) -> None: ...
+
+    @abstractmethod
+    def end(self) -> None: ...
 
-class FuzzTask:
+    @abstractmethod
+    def advance(self) -> None: ...
+
+    @abstractmethod
+    def fail(self) -> None: ...
+
+
+class FuzzTask(AbstractFuzzTask):
     signature: Signature
     task_id: TaskID
     progress: FuzzProgress
@@ -55,6 +93,65 @@ class FuzzTask:
     def advance(self) -> None:
         self.progress.advance(self.task_id)
 
+    def report(self, executions: int, execs_per_sec: float) -> None:
+        """Set the progress to the statistics reported by a native fuzzing engine."""
+        self.progress.update(
+            self.task_id, completed=executions, status=f'[bold]Running[/bold] ({execs_per_sec:,.0f} execs/s)'
+        )
+
     def fail(self) -> None:
         self.progress.update(self.task_id, status='[bold red]Failed')
         self.progress.stop_task(self.task_id)
+
+
+class RemoteFuzzTask(AbstractFuzzTask):
+    # Picklable stand-in for a `FuzzTask` that lives in a worker process.
+    # Updates are sent over `events` and applied by `FuzzProgress.handle_event` in the main process.
+
+    signature: Signature
+    index: int
+    events: Queue[FuzzEvent]
+
+    def __init__(self, signature: Signature, index: int, events: Queue[FuzzEvent]):
+        self.signature = signature
+        self.index = index
+        self.events = events
+
+    def start(self) -> None:
+        self.events.put((self.index, 'start'))
+
+    def end(self) -> None:
+        self.events.put((self.index, 'end'))
+
+    def advance(self) -> None:
+        self.events.put((self.index, 'advance'))
+
+    def fail(self) -> None:
+        self.events.put((self.index, 'fail'))
+
+
+class SliceFuzzTask(AbstractFuzzTask):
+    # Stand-in for `task` while it runs a slice of a test, see `TimeBudget`.
+    # Counts the examples of the slice. Starting and ending the test is left to the scheduler.
+
+    signature: Signature
+    task: AbstractFuzzTask
+    examples: int
+
+    def __init__(self, task: AbstractFuzzTask):
+        self.signature = task.signature
+        self.task = task
+        self.examples = 0
+
+    def start(self) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def advance(self) -> None:
+        self.examples += 1
+        self.task.advance()
+
+    def fail(self) -> None:
+        self.task.fail()
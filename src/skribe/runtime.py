@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING
+
+# Loads the kllvm bindings shipped with K. Has to precede the other `pyk.kllvm` imports, which is also why
+# this module is only imported when in-process execution is requested.
+import pyk.kllvm.load_static  # noqa: F401
+from hypothesis import Phase, given, settings
+from hypothesis.strategies import fixed_dictionaries
+from pyk.kdist import kdist
+from pyk.kllvm import ast as kllvm
+from pyk.kllvm.convert import pattern_to_llvm
+from pyk.kllvm.importer import import_runtime
+
+from .profiler import PROFILER
+from .utils import EXIT_CODE_PYK_HOOK
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from pathlib import Path
+    from typing import Any, Final
+
+    from hypothesis.strategies import SearchStrategy
+    from pyk.kllvm.runtime import Runtime
+    from pyk.kore.syntax import EVar, Pattern
+    from pyk.ktool.kfuzz import KFuzzHandler
+
+
+RUNTIME_TARGET: Final = 'stylus-semantics.llvm-python'
+
+EXIT_CODE_CELL: Final = "Lbl'-LT-'exit-code'-GT-'"
+
+
+@cache
+def load_runtime(runtime_dir: Path | None = None) -> Runtime:
+    """Load the interpreter extension module once per process."""
+    if runtime_dir is None:
+        runtime_dir = kdist.get(RUNTIME_TARGET)
+    return import_runtime(runtime_dir)
+
+
+class InProcessInterpreter:
+    """Runs instances of a template in-process.
+
+    The template is converted to a `kllvm` pattern once and stays resident. For each run, only the template
+    variables are substituted before the term is handed to the interpreter.
+
+    If the semantics stops with `EXIT_CODE_PYK_HOOK`, `handle_hooks` is called with the KORE text of the final
+    configuration to continue execution. It returns the exit code of the eventual final configuration.
+    """
+
+    runtime: Runtime
+    template: kllvm.Pattern
+    handle_hooks: Callable[[str], int]
+
+    def __init__(self, runtime: Runtime, template: Pattern, handle_hooks: Callable[[str], int]):
+        self.runtime = runtime
+        self.template = pattern_to_llvm(template)
+        self.handle_hooks = handle_hooks
+
+    def run(self, subst: Mapping[EVar, Pattern]) -> int:
+        """Run the template with `subst` applied and return the exit code of the final configuration."""
+        with PROFILER.phase('substitute'):
+            pattern = self.template.substitute({var.name: pattern_to_llvm(value) for var, value in subst.items()})
+        with PROFILER.phase('interpreter'):
+            term = self.runtime.term(pattern)
+            term.run()
+
+        result = term.pattern
+        exit_code = _exit_code(result)
+        if exit_code == EXIT_CODE_PYK_HOOK:
+            return self.handle_hooks(str(result))
+        return exit_code
+
+
+def fuzz_in_process(
+    interpreter: InProcessInterpreter,
+    subst_strategy: dict[EVar, SearchStrategy[Pattern]],
+    *,
+    handler: KFuzzHandler,
+    **hypothesis_args: Any,
+) -> None:
+    """Counterpart of `pyk.ktool.kfuzz.fuzz` with `check_exit_code=True` that does not spawn an interpreter."""
+
+    def test(subst_case: Mapping[EVar, Pattern]) -> None:
+        handler.handle_test(subst_case)
+        exit_code = interpreter.run(subst_case)
+        try:
+            assert exit_code == 0
+        except AssertionError:
+            handler.handle_failure(subst_case)
+            raise
+
+    strat: SearchStrategy = fixed_dictionaries(subst_strategy)
+
+    # Same defaults as `pyk.ktool.kfuzz.fuzz`
+    hypothesis_args.setdefault('deadline', 5000)
+    hypothesis_args.setdefault('phases', (Phase.explicit, Phase.reuse, Phase.generate))
+
+    given(strat)(settings(**hypothesis_args)(test))()
+
+
+def _exit_code(pattern: kllvm.Pattern) -> int:
+    cell = _find_cell(pattern, EXIT_CODE_CELL)
+    if cell is None:
+        raise ValueError('Cell <exit-code> not found')
+    (dv,) = cell.arguments
+    (value,) = dv.arguments
+    return int(value.contents)
+
+
+def _find_cell(pattern: kllvm.Pattern, symbol: str) -> kllvm.CompositePattern | None:
+    # Only descend into cells, the configuration structure is shallow compared to the cell contents
+    if not isinstance(pattern, kllvm.CompositePattern):
+        return None
+    name = pattern.constructor.name
+    if name == symbol:
+        return pattern
+    if not name.startswith("Lbl'-LT-'"):
+        return None
+    for arg in pattern.arguments:
+        res = _find_cell(arg, symbol)
+        if res is not None:
+            return res
+    return None
@@ -1,31 +1,38 @@
 from __future__ import annotations
 
 import json
+import logging
 import sys
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import TYPE_CHECKING, Final
+from time import perf_counter
+from typing import TYPE_CHECKING, Final, NamedTuple
+from xml.etree.ElementTree import Element, ElementTree, SubElement
 
 from eth_abi import encode
 from eth_utils import function_signature_to_4byte_selector
 from kontrol.foundry import Foundry
-from pyk.cli.utils import file_path
-from pyk.kast.inner import KSort
-from pyk.kast.prelude.bytes import bytesToken
+from pyk.cli.utils import dir_path, file_path
+from pyk.kore.prelude import bytes_dv
 from pyk.ktool.kprint import KAstOutput, _kast
 from pyk.utils import abs_or_rel_to
 
-from skribe.kast.syntax import (
+from skribe.kore.syntax import (
     call_stylus,
     check_output,
     new_account,
     set_balance,
     set_contract,
     set_exit_code,
-    steps_of,
+    simulation,
 )
 
+from .build import build_foundry_projects
+from .profiler import PROFILER
+from .storage import read_storage_file, slot_count
 from .utils import RECURSION_LIMIT, STYLUS_WASM_PREFIX, PykHooks, concrete_definition
 
 if TYPE_CHECKING:
@@ -33,7 +40,10 @@ if TYPE_CHECKING:
     from subprocess import CompletedProcess
     from typing import Any
 
-    from pyk.kast.inner import KInner
+    from pyk.kore.syntax import Pattern
+
+
+_LOGGER: Final = logging.getLogger(__name__)
 
 
 # TODO Make this parametric
@@ -72,17 +82,13 @@ def call_data_from_dict(d: dict[str, Any]) -> bytes:
     )
 
 
-def run(test_file: Path, depth: int | None) -> CompletedProcess:
-    test = json.loads(test_file.read_text())
-
-    steps_dict = test['steps']
-
-    kast_steps = (step for item in steps_dict for step in steps_from_dict(item, test_file))
-    program = steps_of(kast_steps)
+def run(test_file: Path, depth: int | None, build: bool = True) -> CompletedProcess:
+    if build:
+        # Build the Foundry projects of the EVM contracts up front and in parallel
+        build_foundry_projects(foundry_dirs(test_file))
 
     return concrete_definition.krun_with_pyk_hooks(
-        pgm=program,
-        sort=KSort('EthereumSimulation'),
+        pgm=load_program(test_file),
         depth=depth,
         cmap=config_vars(),
         pmap=CONFIG_VAR_PARSERS,
@@ -90,6 +96,125 @@ def run(test_file: Path, depth: int | None) -> CompletedProcess:
     )
 
 
+def run_with_statistics(test_file: Path, depth: int | None) -> tuple[CompletedProcess, int | None]:
+    """Like `run` without building, but also return the number of rewrite steps, ``None`` if it is not reported."""
+    # Only initialize the configuration with `krun`, so that all rewrite steps are taken, and counted, by the interpreter
+    init_res = concrete_definition.krun_with_kore(
+        load_program(test_file),
+        depth=0,
+        cmap=config_vars(),
+        pmap=CONFIG_VAR_PARSERS,
+    )
+    if not init_res.stdout:
+        return init_res, None
+
+    return concrete_definition.krun_term_with_statistics(init_res.stdout, PykHooks(test_file.parent), depth=depth)
+
+
+def load_program(test_file: Path) -> str:
+    """The KORE text of the program of a simulation file.
+
+    Loading includes reading the contract code and storage files, and serializing the program, and its duration is
+    logged.
+    """
+    start = perf_counter()
+    program_text = program_from_file(test_file).text
+    elapsed = perf_counter() - start
+
+    PROFILER.record('load_program', elapsed)
+    _LOGGER.info(f'Loaded program of {test_file} in {elapsed:.3f}s')
+    return program_text
+
+
+def program_from_file(test_file: Path) -> Pattern:
+    steps_dict = json.loads(test_file.read_text())['steps']
+    return simulation(step for item in steps_dict for step in steps_from_dict(item, test_file))
+
+
+def foundry_dirs(test_file: Path) -> list[Path]:
+    """Directories of the Foundry projects of the `setEVMContract` steps of a simulation file."""
+    steps_dict = json.loads(test_file.read_text())['steps']
+    return [
+        abs_or_rel_to(Path(item['directory']), test_file.parent)
+        for item in steps_dict
+        if item['type'] == 'setEVMContract'
+    ]
+
+
+class SimulationResult(NamedTuple):
+    test_file: Path
+    returncode: int
+    time: float
+    steps: int | None
+    output: str
+
+    @property
+    def passed(self) -> bool:
+        return self.returncode == 0
+
+
+def run_all(test_files: Iterable[Path], depth: int | None = None, jobs: int = 1) -> list[SimulationResult]:
+    """Run simulation files on `jobs` worker threads, and return their results in the order of `test_files`.
+
+    The interpreter runs in subprocesses, so the workers run simulations in parallel while sharing the loaded
+    definition. The Foundry projects of all files are built once, up front.
+    """
+    test_files = list(test_files)
+    build_foundry_projects(project_dir for test_file in test_files for project_dir in foundry_dirs(test_file))
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(lambda test_file: _run_timed(test_file, depth), test_files))
+
+
+def _run_timed(test_file: Path, depth: int | None) -> SimulationResult:
+    start = perf_counter()
+    try:
+        proc_res, steps = run_with_statistics(test_file, depth)
+    except Exception as err:
+        return SimulationResult(test_file, 1, perf_counter() - start, None, f'{type(err).__name__}: {err}')
+    return SimulationResult(test_file, proc_res.returncode, perf_counter() - start, steps, proc_res.stderr)
+
+
+def write_json_summary(results: Iterable[SimulationResult], output_file: Path) -> None:
+    summary = [
+        {
+            'file': str(result.test_file),
+            'passed': result.passed,
+            'exit_code': result.returncode,
+            'time': result.time,
+            'steps': result.steps,
+        }
+        for result in results
+    ]
+    output_file.write_text(json.dumps(summary, indent=2))
+
+
+def write_junit_summary(results: Iterable[SimulationResult], output_file: Path) -> None:
+    results = list(results)
+    suite = Element(
+        'testsuite',
+        name='skribe-simulation',
+        tests=str(len(results)),
+        failures=str(sum(not result.passed for result in results)),
+        time=f'{sum(result.time for result in results):.3f}',
+    )
+    for result in results:
+        case = SubElement(
+            suite,
+            'testcase',
+            name=result.test_file.name,
+            classname=str(result.test_file.parent),
+            time=f'{result.time:.3f}',
+        )
+        if result.steps is not None:
+            properties = SubElement(case, 'properties')
+            SubElement(properties, 'property', name='steps', value=str(result.steps))
+        if not result.passed:
+            failure = SubElement(case, 'failure', message=f'Exit code {result.returncode}')
+            failure.text = result.output
+    ElementTree(suite).write(output_file, encoding='utf-8', xml_declaration=True)
+
+
 def json_to_storage_map(o: dict[Any, Any]) -> dict[int, int]:
     return {int(k): int(v) for k, v in o.items()}
 
@@ -100,7 +225,7 @@ def parse_account_id(x: int | str) -> int:
     return int(x)
 
 
-def steps_from_dict(d: dict[str, Any], file_path: Path) -> list[KInner]:
+def steps_from_dict(d: dict[str, Any], file_path: Path) -> list[Pattern]:
     step_type = d['type']
 
     match step_type:
@@ -112,25 +237,20 @@ def steps_from_dict(d: dict[str, Any], file_path: Path) -> list[KInner]:
             return [set_balance(parse_account_id(d['id']), int(d['value']))]
         case 'setStylusContract':
             wasm_path = abs_or_rel_to(Path(d['code']), file_path.parent)
-            storage = json_to_storage_map(d.get('storage', {}))
-            acct_id = parse_account_id(d['id'])
             bytecode = STYLUS_WASM_PREFIX + wasm_path.read_bytes()
-            return [set_contract(id=acct_id, code=bytesToken(bytecode), storage=storage)]
+            return [_set_contract(d, bytecode, file_path)]
         case 'setEVMContract':
             contract_dir = abs_or_rel_to(Path(d['directory']), file_path.parent)
             foundry = Foundry(contract_dir)
-            foundry.build(True)
             contract = foundry.contracts[foundry.lookup_full_contract_name(d['name'])]
             bytecode = bytes.fromhex(contract.deployed_bytecode)
-            storage = json_to_storage_map(d.get('storage', {}))
-            acct_id = parse_account_id(d['id'])
-            return [set_contract(id=acct_id, code=bytesToken(bytecode), storage=storage)]
+            return [_set_contract(d, bytecode, file_path)]
         case 'callStylus':
 
             call_cmd = call_stylus(
                 from_account=d.get('from', None),
                 to_account=d.get('to', None),
-                data=bytesToken(call_data_from_dict(d['data'])),
+                data=bytes_dv(call_data_from_dict(d['data'])),
                 value=int(d.get('value', 0)),
             )
 
@@ -145,6 +265,21 @@ def steps_from_dict(d: dict[str, Any], file_path: Path) -> list[KInner]:
     raise ValueError(f'Invalid step type: {step_type}')
 
 
+def _set_contract(d: dict[str, Any], bytecode: bytes, file_path: Path) -> Pattern:
+    # The initial storage is read from `storageFile`, see `skribe.storage`, and `storage`.
+    # Slots in `storage` take precedence over the slots in the file.
+    acct_id = parse_account_id(d['id'])
+    storage = json_to_storage_map(d.get('storage', {}))
+    if 'storageFile' not in d:
+        return set_contract(id=acct_id, code=bytecode, storage=storage.items())
+
+    storage_file = abs_or_rel_to(Path(d['storageFile']), file_path.parent)
+    _LOGGER.info(f'Reading {slot_count(storage_file)} storage slots of account {acct_id} from {storage_file}')
+
+    file_storage = ((key, value) for key, value in read_storage_file(storage_file) if key not in storage)
+    return set_contract(id=acct_id, code=bytecode, storage=chain(file_storage, storage.items()))
+
+
 def _exec_run(test_file: Path, output: KAstOutput, depth: int | None) -> None:
     res = run(test_file, depth)
 
@@ -167,6 +302,34 @@ def _exec_run(test_file: Path, output: KAstOutput, depth: int | None) -> None:
         sys.exit(res.returncode)
 
 
+def _exec_run_all(
+    directory: Path,
+    jobs: int,
+    depth: int | None,
+    json_file: Path | None,
+    junit_file: Path | None,
+) -> None:
+    test_files = sorted(directory.glob('*.json'))
+    results = run_all(test_files, depth=depth, jobs=jobs)
+
+    for result in results:
+        status = 'PASSED' if result.passed else 'FAILED'
+        steps = f', {result.steps} steps' if result.steps is not None else ''
+        print(f'{status} {result.test_file} ({result.time:.2f}s{steps})', flush=True)
+        if not result.passed and result.output:
+            print(result.output, end='', file=sys.stderr, flush=True)
+
+    failed = sum(not result.passed for result in results)
+    print(f'{len(results) - failed} passed, {failed} failed')
+
+    if json_file is not None:
+        write_json_summary(results, json_file)
+    if junit_file is not None:
+        write_junit_summary(results, junit_file)
+
+    sys.exit(1 if failed else 0)
+
+
 def main() -> None:
     sys.setrecursionlimit(RECURSION_LIMIT)
 
@@ -175,9 +338,28 @@ def main() -> None:
 
     if args.command == 'run':
         _exec_run(test_file=args.program, output=args.output, depth=args.depth)
+    elif args.command == 'run-all':
+        _exec_run_all(
+            directory=args.directory,
+            jobs=args.jobs,
+            depth=args.depth,
+            json_file=args.json,
+            junit_file=args.junit,
+        )
 
 
 def _argument_parser() -> ArgumentParser:
+    def positive_int(s: str) -> int:
+        try:
+            n = int(s)
+        except ValueError as err:
+            raise ArgumentTypeError(f'Value is not an integer: {s!r}') from err
+
+        if n <= 0:
+            raise ArgumentTypeError(f'Value is not positive: {s!r}')
+
+        return n
+
     parser = ArgumentParser(
         prog='skribe-simulation',
         description='A CLI tool for simulating Stylus smart contract executions using formal semantics.',
@@ -200,6 +382,34 @@ def _argument_parser() -> ArgumentParser:
     )
     run_parser.add_argument('--depth', type=int, help='Maximum number of execution (K) steps to simulate')
 
+    run_all_parser = command_parser.add_parser('run-all', help='run all concrete tests in a directory')
+    run_all_parser.add_argument(
+        'directory',
+        metavar='DIR',
+        type=dir_path,
+        help='Path to a directory of JSON files, each describing a test case',
+    )
+    run_all_parser.add_argument(
+        '--jobs',
+        '-j',
+        type=positive_int,
+        default=1,
+        help='Number of test cases to run in parallel (default: 1)',
+    )
+    run_all_parser.add_argument('--depth', type=int, help='Maximum number of execution (K) steps to simulate')
+    run_all_parser.add_argument(
+        '--json',
+        metavar='FILE',
+        type=Path,
+        help='Write a JSON summary with the result, wall time and K step count of each test case to FILE',
+    )
+    run_all_parser.add_argument(
+        '--junit',
+        metavar='FILE',
+        type=Path,
+        help='Write a JUnit XML report of the test cases to FILE',
+    )
+
     return parser
 
 
@@ -1,59 +1,89 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import shutil
 import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from functools import cached_property
+from importlib.metadata import version
+from multiprocessing import Manager, get_context
 from pathlib import Path
+from time import perf_counter
 from typing import TYPE_CHECKING, NamedTuple
 
 from eth_abi import decode, encode
+from hypothesis import Phase, given, settings
 from hypothesis import strategies as st
+from hypothesis import target
+from hypothesis.database import DirectoryBasedExampleDatabase
 from kontrol.foundry import Foundry
-from pyk.kast.inner import KSort, KToken, KVariable
-from pyk.kast.manip import Subst, split_config_from
-from pyk.kast.prelude.bytes import BYTES, bytesToken, pretty_bytes
-from pyk.kast.prelude.k import GENERATED_TOP_CELL
-from pyk.kast.prelude.kbool import BOOL
-from pyk.konvert import kast_to_kore, kore_to_kast
+from pyk.konvert import kore_to_kast
+from pyk.kore.manip import substitute_vars
+from pyk.kore.match import kore_bytes
 from pyk.kore.parser import KoreParser
 from pyk.kore.prelude import dv
-from pyk.kore.syntax import EVar, SortApp
+from pyk.kore.syntax import App, EVar, SortApp
 from pyk.ktool.kfuzz import KFuzzHandler, fuzz
-from pyk.ktool.krun import KRunOutput
-from pyk.utils import check_file_path, run_process
-
-from .contract import Signature, StylusContract, is_foundry_test, setup_method
-from .kast.syntax import (
+from pyk.ktool.krun import KRunOutput, llvm_interpret_raw
+from pyk.utils import check_file_path, hash_file, hash_str, run_process
+
+from .budget import TimeBudget
+from .build import BuildCache, build_foundry
+from .cache import FileCache, project_cache_dir, user_cache_dir
+from .contract import Signature, StylusContract, deployed_bytecode, is_foundry_test, setup_method
+from .kore.syntax import (
+    bytes_list,
+    cache_stylus_modules,
     call_stylus,
+    call_stylus_batch,
     check_foundry_success,
     check_output,
+    k_cell,
     new_account,
     set_contract,
     set_exit_code,
-    steps_of,
+    simulation,
 )
-from .progress import FuzzProgress
+from .native import NativeFuzzer, fuzz_test_dir
+from .profiler import PROFILER
+from .progress import FuzzProgress, RemoteFuzzTask, SliceFuzzTask
 from .simulation import CONFIG_VAR_PARSERS, call_data, config_vars
-from .utils import RECURSION_LIMIT, PykHooks, SkribeError
+from .spec_file import SpecFile, is_spec_file, spec_file_bytes
+from .utils import (
+    COVERAGE_ENABLED_CELL_PATH,
+    EXIT_CODE_PYK_HOOK,
+    K_CELL_PATH,
+    RECURSION_LIMIT,
+    PykHooks,
+    SkribeDefinition,
+    SkribeError,
+    coverage_bitmap,
+    find_cell_text,
+    replace_cell,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Mapping
+    from queue import Queue
+    from subprocess import CompletedProcess
     from typing import Any
 
+    from hypothesis.strategies import SearchStrategy
     from pyk.kast.inner import KInner
     from pyk.kore.syntax import Pattern
 
     from .contract import ArbitrumContract
-    from .progress import FuzzTask
-    from .utils import SkribeDefinition
+    from .profiler import ProfileSamples
+    from .progress import AbstractFuzzTask, FuzzEvent
 
 
-CALLDATA = KVariable('CALLDATA', BYTES)
 CALLDATA_EVAR = EVar('VarCALLDATA', SortApp('SortBytes'))
 
-COVERAGE_ENABLED = KVariable('COVERAGE_ENABLED', BOOL)
+CALLDATAS_EVAR = EVar('VarCALLDATAS', SortApp('SortList'))
+
 COVERAGE_ENABLED_EVAR = EVar("VarCOVERAGE'Unds'ENABLED", SortApp('SortBool'))
+COVERAGE_ENABLED_CELL = "Lbl'-LT-'coverageEnabled'-GT-'"
 
 TRUE_DATA = encode(['bool'], [True])
 EMPTY_DATA = encode([], [])
@@ -71,42 +101,76 @@ class FuzzSpec(NamedTuple):
     def dict(self) -> dict[str, Any]:
         return {
             'template': self.template.text,
-            'signatures': [
-                {
-                    'contract_name': signature.contract_name,
-                    'name': signature.name,
-                    'arg_types': list(signature.arg_types),
-                }
-                for signature in self.signatures
-            ],
+            'signatures': self.signature_dicts,
         }
 
+    @property
+    def signature_dicts(self) -> list[dict[str, Any]]:
+        return [
+            {
+                'contract_name': signature.contract_name,
+                'name': signature.name,
+                'arg_types': list(signature.arg_types),
+            }
+            for signature in self.signatures
+        ]
+
+    @staticmethod
+    def dump_binary(specs: Iterable[FuzzSpec], compress: bool = False) -> bytes:
+        return spec_file_bytes(((spec.template.text, spec.signature_dicts) for spec in specs), compress=compress)
+
     @staticmethod
-    def load_specs(file_path: Path) -> list[FuzzSpec]:
+    def load_specs(file_path: Path, id: str | None = None) -> list[FuzzSpec]:
+        """Load the specs from a JSON or binary spec file.
+
+        If `id` is given, only the specs with a test function of that name are loaded, and for binary files only
+        their templates are read.
+        """
         check_file_path(file_path)
 
+        if is_spec_file(file_path):
+            return FuzzSpec._load_binary_specs(file_path, id)
+
         with file_path.open() as f:
             dcts = json.load(f)
 
-        return [FuzzSpec.from_dict(dct) for dct in dcts]
+        with PROFILER.phase('kore_parse'):
+            return [
+                FuzzSpec.from_dict(dct)
+                for dct in dcts
+                if _filter_signatures(map(_sig_from_dict, dct['signatures']), id)
+            ]
 
     @staticmethod
-    def from_dict(dct: Mapping[str, Any]) -> FuzzSpec:
-        def sig_from_dict(dct: Mapping[str, Any]) -> Signature:
-            match dct:
-                case {
-                    'contract_name': contract_name,
-                    'name': name,
-                    'arg_types': arg_types,
-                }:
-                    return Signature(
-                        contract_name=contract_name,
-                        name=name,
-                        arg_types=tuple(arg_types),
-                    )
-                case _:
-                    raise ValueError('Invalid Signature dictionary: {dct}')
+    def load_signatures(file_path: Path, id: str | None = None) -> list[Signature]:
+        """Load the signatures from a JSON or binary spec file without parsing the templates."""
+        check_file_path(file_path)
+
+        if is_spec_file(file_path):
+            with SpecFile(file_path) as spec_file:
+                sig_dcts = [sig_dct for entry in spec_file.entries for sig_dct in entry.signatures]
+        else:
+            with file_path.open() as f:
+                sig_dcts = [sig_dct for dct in json.load(f) for sig_dct in dct['signatures']]
 
+        return _filter_signatures(map(_sig_from_dict, sig_dcts), id)
+
+    @staticmethod
+    def _load_binary_specs(file_path: Path, id: str | None) -> list[FuzzSpec]:
+        specs = []
+        with SpecFile(file_path) as spec_file:
+            for spec_ix, entry in enumerate(spec_file.entries):
+                signatures = tuple(_sig_from_dict(sig_dct) for sig_dct in entry.signatures)
+                if not _filter_signatures(signatures, id):
+                    continue
+                template_text = spec_file.template_text(spec_ix)
+                with PROFILER.phase('kore_parse'):
+                    template = KoreParser(template_text).pattern()
+                specs.append(FuzzSpec(template=template, signatures=signatures))
+        return specs
+
+    @staticmethod
+    def from_dict(dct: Mapping[str, Any]) -> FuzzSpec:
         match dct:
             case {
                 'template': template_text,
@@ -114,12 +178,28 @@ class FuzzSpec(NamedTuple):
             }:
                 return FuzzSpec(
                     template=KoreParser(template_text).pattern(),
-                    signatures=tuple(sig_from_dict(sig_dct) for sig_dct in signatures),
+                    signatures=tuple(_sig_from_dict(sig_dct) for sig_dct in signatures),
                 )
             case _:
                 raise ValueError('Invalid FuzzSpec dictionary: {dct}')
 
 
+def _sig_from_dict(dct: Mapping[str, Any]) -> Signature:
+    match dct:
+        case {
+            'contract_name': contract_name,
+            'name': name,
+            'arg_types': arg_types,
+        }:
+            return Signature(
+                contract_name=contract_name,
+                name=name,
+                arg_types=tuple(arg_types),
+            )
+        case _:
+            raise ValueError('Invalid Signature dictionary: {dct}')
+
+
 class Skribe:
     definition: SkribeDefinition
     contract_dir: Path
@@ -144,26 +224,41 @@ class Skribe:
     def _cargo_bin(self) -> Path:
         return self._which('cargo')
 
-    def build_contract(self) -> None:
+    def build_contract(self, force: bool = False) -> None:
+        """Build the test contract, unless it is unchanged since its last build, see `BuildCache`."""
         if self.is_foundry:
-            foundry = Foundry(self.contract_dir)
-            foundry.build(True)
+            build_foundry(self.contract_dir, force=force)
         else:
-            run_process(
-                [str(self._cargo_bin), 'stylus', 'build'],
-                cwd=self.contract_dir,
-                check=True,
-            )
+            contract = StylusContract(cargo_bin=self._cargo_bin, contract_dir=self.contract_dir)
+            build_cache = BuildCache(self.contract_dir)
+            if force or not build_cache.is_fresh(contract.fingerprint, [contract.wasm_path]):
+                with PROFILER.phase('cargo'):
+                    run_process(
+                        [str(self._cargo_bin), 'stylus', 'build'],
+                        cwd=self.contract_dir,
+                        check=True,
+                    )
+                build_cache.record(contract.fingerprint)
+            # Only evaluated to export the ABI while the build artifacts are fresh, so that running the tests hits the
+            # cache of `cargo stylus export-abi`
+            _ = contract.abi
+
+    def deploy_test(self, contract: bytes, setup: bool, hooks: PykHooks | None = None) -> KInner:
+        """Like `deploy_test_pattern`, but returns the configuration as a kast term."""
+        kore_result = self.deploy_test_pattern(contract, setup, hooks)
+        with PROFILER.phase('kore_to_kast'):
+            return kore_to_kast(self.definition.kdefinition, kore_result)
 
-    def deploy_test(self, contract: KInner, setup: bool) -> KInner:
-        """Takes a Stylus contract and its dependencies as kast terms and deploys them in a fresh configuration.
+    def deploy_test_pattern(self, contract: bytes, setup: bool, hooks: PykHooks | None = None) -> Pattern:
+        """Takes the deployed bytecode of a test contract and deploys it in a fresh configuration.
 
         Args:
-            contract: The test contract to deploy, represented as a kast term.
+            contract: The deployed bytecode of the test contract.
             setup: Whether to initialize the contract by calling its 'setUp' function after deployment.
+            hooks: Pyk hook handler to use during deployment, a fresh one if not given.
 
         Returns:
-            A configuration with the contract deployed.
+            A configuration with the contract deployed, as the KORE output of the interpreter.
 
         Raises:
             InitializationError if the deployment fails
@@ -172,25 +267,27 @@ class Skribe:
         # Stylus currently does not support constructors. As a workaround,
         # test contracts that require constructor-like behavior are expected to
         # implement a `setUp` function
-        def call_setup(setup: bool) -> tuple[KInner, ...]:
+        def call_setup(setup: bool) -> tuple[Pattern, ...]:
             if not setup:
                 return ()
 
             setup_call_data = call_data('setUp', [], [])
 
             return (
-                call_stylus(TEST_CALLER_ID, TEST_CONTRACT_ID, bytesToken(setup_call_data), 0),
+                call_stylus(TEST_CALLER_ID, TEST_CONTRACT_ID, dv(setup_call_data), 0),
                 check_output(EMPTY_DATA),
             )
 
         # Set up the steps that will deploy the contract
-        steps = steps_of(
+        steps = simulation(
             [
                 set_exit_code(1),
                 new_account(TEST_CALLER_ID),
-                set_contract(CHEATCODE_ID, bytesToken(b'\x00'), {}),
+                set_contract(CHEATCODE_ID, b'\x00', ()),
                 set_contract(TEST_CONTRACT_ID, contract, {}),
                 *(call_setup(setup)),
+                # Parse all Stylus modules now, fuzzing runs start from the resulting configuration
+                cache_stylus_modules(),
                 set_exit_code(0),
             ]
         )
@@ -198,29 +295,31 @@ class Skribe:
         # Run the steps and grab the resulting config as a starting place to call transactions
         proc_res = self.definition.krun_with_pyk_hooks(
             steps,
-            sort=KSort('EthereumSimulation'),
             output=KRunOutput.KORE,
             cmap=config_vars(),
             pmap=CONFIG_VAR_PARSERS,
-            hooks=PykHooks(self.contract_dir),
+            hooks=hooks if hooks is not None else PykHooks(self.contract_dir),
         )
         if proc_res.returncode:
             raise InitializationError
 
-        kore_result = KoreParser(proc_res.stdout).pattern()
-        result_config = kore_to_kast(self.definition.kdefinition, kore_result)
-
-        return result_config
+        with PROFILER.phase('kore_parse'):
+            return KoreParser(proc_res.stdout).pattern()
 
     def run_test(
         self,
         template_pattern: Pattern,
         signature: Signature,
         max_examples: int,
-        task: FuzzTask,
+        task: AbstractFuzzTask,
         deadline: int | None = None,
         coverage_enabled: bool | None = None,
-    ) -> None:
+        in_process: bool = False,
+        batch_size: int = 1,
+        fuzz_workspace: Path | None = None,
+        replay: bool = False,
+        template_digest: str | None = None,
+    ) -> int:
         """Given a configuration with a deployed test contract, fuzz over the tests for the supplied signature.
 
         Args:
@@ -229,30 +328,148 @@ class Skribe:
             max_examples: The maximum number of fuzzing test cases to generate and execute.
             deadline: Fuzzer iteration deadline in milliseconds, or ``None`` for no dealine.
             coverage_enabled: Whether coverage tracking is enabled.
+            in_process: Whether to execute examples in-process through the LLVM backend Python bindings
+              instead of spawning the interpreter for each example.
+            batch_size: The maximum number of calldatas to execute in a single interpreter run. Each example is a
+              batch of up to `batch_size` calls, see `callStylusBatch`.
+            fuzz_workspace: The workspace of `skribe-fuzz` to export the calldata of failing examples, and of batches
+              that increase coverage, to as seeds. ``None`` for not exporting seeds.
+            replay: Whether to only re-execute the failing and interesting examples stored in the example database
+              by previous runs, instead of generating new ones.
+            template_digest: The digest of the template, see `template_digest`. Computed from the template if
+              ``None``, pass it to run several tests of the same template.
+
+        Returns:
+            The union of the coverage bitmaps of the examples as an integer, ``0`` if coverage is not measured. Coverage
+            is measured for batches with coverage tracking enabled.
 
         Raises:
             AssertionError if the test fails
         """
-
-        def calldata_to_kore(data: bytes) -> Pattern:
-            return kast_to_kore(self.definition.kdefinition, bytesToken(data), BYTES)
+        if batch_size > 1 and in_process:
+            raise ValueError('Batched execution is not supported in-process')
 
         template_subst = {
-            CALLDATA_EVAR: signature.argument_strategy().map(calldata_to_kore),
+            CALLDATA_EVAR: signature.argument_strategy().map(dv),
             COVERAGE_ENABLED_EVAR: st.just(dv(bool(coverage_enabled))),
         }
 
-        task.start()
-        fuzz(
-            self.definition.path,
-            template_pattern,
-            template_subst,
-            check_exit_code=True,
-            max_examples=max_examples,
-            handler=KometFuzzHandler(self.definition, task),
-            deadline=deadline,
+        seeds = FileCache(fuzz_seed_dir(fuzz_workspace, signature)) if fuzz_workspace is not None else None
+        handler = KometFuzzHandler(self.definition, task, seeds=seeds)
+
+        hypothesis_args: dict[str, Any] = {
+            'max_examples': max_examples,
+            'deadline': deadline,
+            'database': self.example_database(
+                signature, template_digest if template_digest is not None else _template_digest(template_pattern)
+            ),
+        }
+        if replay:
+            hypothesis_args['phases'] = (Phase.explicit, Phase.reuse)
+
+        with PROFILER.test(signature.qualified_name):
+            task.start()
+            if batch_size > 1:
+                self._fuzz_batches(
+                    self.batch_template(template_pattern),
+                    template_subst,
+                    batch_size,
+                    coverage_enabled=bool(coverage_enabled),
+                    handler=handler,
+                    **hypothesis_args,
+                )
+            elif in_process:
+                # Imported on demand, as importing the module loads the kllvm bindings
+                from .runtime import InProcessInterpreter, fuzz_in_process, load_runtime
+
+                interpreter = InProcessInterpreter(load_runtime(), template_pattern, self._continue_with_pyk_hooks)
+                fuzz_in_process(
+                    interpreter,
+                    template_subst,
+                    handler=handler,
+                    **hypothesis_args,
+                )
+            else:
+                fuzz(
+                    self.definition.path,
+                    template_pattern,
+                    template_subst,
+                    check_exit_code=True,
+                    handler=handler,
+                    subst_func=_substitute_vars,
+                    **hypothesis_args,
+                )
+            task.end()
+
+        return handler.covered
+
+    def batch_template(self, template_pattern: Pattern) -> Pattern:
+        """Replace the single test call in the <k> cell of a template with a batch of calls to the test contract."""
+        k_cell_pattern = k_cell([call_stylus_batch(TEST_CALLER_ID, TEST_CONTRACT_ID, CALLDATAS_EVAR)])
+        return replace_cell(K_CELL_PATH, k_cell_pattern)(template_pattern)
+
+    def _fuzz_batches(
+        self,
+        template: Pattern,
+        subst_strategy: Mapping[EVar, SearchStrategy[Pattern]],
+        batch_size: int,
+        *,
+        coverage_enabled: bool,
+        handler: KometFuzzHandler,
+        **hypothesis_args: Any,
+    ) -> None:
+        """Fuzz a batch template, where each example is a batch of up to `batch_size` calldatas.
+
+        Every variable of the single call template in `subst_strategy` takes a single value per batch, except for
+        `CALLDATA_EVAR`, which is drawn for each call. If a batch fails, only the failing call is passed to the handler.
+        If `coverage_enabled`, Hypothesis is guided towards batches that cover more of the contract code.
+        """
+        calldata_strategy = subst_strategy[CALLDATA_EVAR]
+        other_strategies = {var: strategy for var, strategy in subst_strategy.items() if var != CALLDATA_EVAR}
+        strat: SearchStrategy = st.tuples(
+            st.lists(calldata_strategy, min_size=1, max_size=batch_size),
+            st.fixed_dictionaries(other_strategies),
         )
-        task.end()
+
+        def test(case: tuple[list[Pattern], dict[EVar, Pattern]]) -> None:
+            calldatas, subst_case = case
+            subst_case = {**subst_case, CALLDATAS_EVAR: bytes_list(calldatas)}
+            handler.handle_test(subst_case)
+
+            proc_res = self.run_batch(template, subst_case)
+
+            if coverage_enabled:
+                bitmap = coverage_bitmap(proc_res.stdout)
+                target(len(bitmap) - bitmap.count(0), label='covered bytes')
+
+                # Batches that cover new code are seeds for `skribe-fuzz`
+                if handler.handle_coverage(bitmap) and handler.seeds is not None:
+                    for calldata in calldatas:
+                        handler.save_seed(handler.calldata(calldata))
+
+            if proc_res.returncode != 0:
+                failed_ix = failed_call_index(proc_res.stdout, len(calldatas))
+                handler.handle_failure({**subst_case, CALLDATA_EVAR: calldatas[failed_ix]})
+                raise AssertionError(f'Call {failed_ix} of batch failed with exit code {proc_res.returncode}')
+
+        # Same defaults as `pyk.ktool.kfuzz.fuzz`
+        hypothesis_args.setdefault('deadline', 5000)
+        hypothesis_args.setdefault('phases', (Phase.explicit, Phase.reuse, Phase.generate))
+
+        given(strat)(settings(**hypothesis_args)(test))()
+
+    def run_batch(self, template: Pattern, subst: Mapping[EVar, Pattern]) -> CompletedProcess:
+        """Run a batch template, see `batch_template`, with `subst` applied, and return the last interpreter run."""
+        test_pattern = _substitute_vars(template, subst)
+        with PROFILER.phase('interpreter'):
+            proc_res = llvm_interpret_raw(self.definition.path, test_pattern.text, check=False)
+        if proc_res.returncode == EXIT_CODE_PYK_HOOK:
+            proc_res = self.definition.krun_term_with_pyk_hooks(proc_res.stdout, PykHooks(self.contract_dir))
+        return proc_res
+
+    def _continue_with_pyk_hooks(self, config: str) -> int:
+        proc_res = self.definition.krun_term_with_pyk_hooks(config, PykHooks(self.contract_dir))
+        return proc_res.returncode
 
     def deploy_and_run(
         self,
@@ -261,15 +478,72 @@ class Skribe:
         deadline: int | None = None,
         coverage_enabled: bool | None = None,
         fuzz_spec_file: Path | None = None,
+        jobs: int = 1,
+        in_process: bool = False,
+        batch_size: int = 1,
+        fuzz_workspace: Path | None = None,
+        engine: str = 'hypothesis',
+        replay: bool = False,
+        time_budget: float | None = None,
     ) -> list[FuzzError]:
+        if batch_size > 1 and in_process:
+            raise ValueError('Batched execution is not supported in-process')
+
+        if time_budget is not None:
+            if jobs > 1 or replay:
+                raise ValueError('Time budgets are not supported with parallel jobs or replay')
+            if not coverage_enabled or batch_size == 1:
+                raise ValueError('Time budgets require coverage tracking and batches to measure coverage growth')
+
+        if engine != 'hypothesis':
+            if in_process or batch_size > 1 or replay or time_budget is not None:
+                raise ValueError(
+                    f'In-process and batched execution, replay and time budgets are not supported by the {engine} engine'
+                )
+            return self._run_native(
+                engine,
+                max_examples,
+                id,
+                coverage_enabled=coverage_enabled,
+                fuzz_spec_file=fuzz_spec_file,
+                jobs=jobs,
+                fuzz_workspace=fuzz_workspace,
+            )
+
         specs: list[FuzzSpec]
         if fuzz_spec_file:
-            specs = FuzzSpec.load_specs(fuzz_spec_file)
+            specs = FuzzSpec.load_specs(fuzz_spec_file, id=id)
         else:
             # Deploy
-            specs = self.init_specs()
+            specs = self.init_specs(jobs=jobs)
 
         # Run
+        if time_budget is not None:
+            return self._run_specs_with_budget(
+                specs,
+                time_budget,
+                id,
+                deadline=deadline,
+                coverage_enabled=coverage_enabled,
+                in_process=in_process,
+                batch_size=batch_size,
+                fuzz_workspace=fuzz_workspace,
+            )
+
+        if jobs > 1:
+            return self._run_specs_parallel(
+                specs,
+                max_examples,
+                jobs,
+                id,
+                deadline=deadline,
+                coverage_enabled=coverage_enabled,
+                in_process=in_process,
+                batch_size=batch_size,
+                fuzz_workspace=fuzz_workspace,
+                replay=replay,
+            )
+
         errors: list[FuzzError] = []
         for spec in specs:
             errors += self._run_spec(
@@ -278,13 +552,38 @@ class Skribe:
                 id,
                 deadline=deadline,
                 coverage_enabled=coverage_enabled,
+                in_process=in_process,
+                batch_size=batch_size,
+                fuzz_workspace=fuzz_workspace,
+                replay=replay,
             )
 
         return errors
 
-    def init_specs(self) -> list[FuzzSpec]:
+    def init_specs(self, jobs: int = 1) -> list[FuzzSpec]:
+        """Create the specs of the test contracts, in the order of `_load_contracts`.
+
+        With `jobs` above 1, the specs are created on a pool of `jobs` worker processes, which bounds the number of
+        deployments in memory at the same time. Workers send templates back as KORE text.
+        """
         contracts = self._load_contracts()
-        specs = [self._create_spec(contract) for contract in contracts]
+        if jobs == 1 or len(contracts) <= 1:
+            return [self._create_spec(contract) for contract in contracts]
+
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(contracts)),
+            mp_context=get_context('spawn'),
+            initializer=_init_spec_worker,
+            initargs=(self.definition.path, self.contract_dir, PROFILER.enabled),
+        ) as executor:
+            results = list(executor.map(_create_spec_in_worker, range(len(contracts))))
+
+        specs: list[FuzzSpec] = []
+        for template_text, signatures, samples in results:
+            PROFILER.merge(samples)
+            with PROFILER.phase('kore_parse'):
+                template = KoreParser(template_text).pattern()
+            specs.append(FuzzSpec(template=template, signatures=signatures))
         return specs
 
     def _run_spec(
@@ -294,8 +593,13 @@ class Skribe:
         id: str | None = None,
         deadline: int | None = None,
         coverage_enabled: bool | None = None,
+        in_process: bool = False,
+        batch_size: int = 1,
+        fuzz_workspace: Path | None = None,
+        replay: bool = False,
     ) -> list[FuzzError]:
         signatures = _filter_signatures(spec.signatures, id=id)
+        template_digest = _template_digest(spec.template)
 
         errors: list[FuzzError] = []
         with FuzzProgress(signatures, max_examples) as progress:
@@ -308,6 +612,11 @@ class Skribe:
                         task,
                         deadline=deadline,
                         coverage_enabled=coverage_enabled,
+                        in_process=in_process,
+                        batch_size=batch_size,
+                        fuzz_workspace=fuzz_workspace,
+                        replay=replay,
+                        template_digest=template_digest,
                     )
                 except FuzzError as e:
                     task.fail()
@@ -315,6 +624,194 @@ class Skribe:
 
         return errors
 
+    def _run_specs_parallel(
+        self,
+        specs: list[FuzzSpec],
+        max_examples: int,
+        jobs: int,
+        id: str | None = None,
+        deadline: int | None = None,
+        coverage_enabled: bool | None = None,
+        in_process: bool = False,
+        batch_size: int = 1,
+        fuzz_workspace: Path | None = None,
+        replay: bool = False,
+    ) -> list[FuzzError]:
+        """Fuzz the signatures of all specs on a pool of `jobs` worker processes.
+
+        Each worker loads the definition and parses the templates once, then runs whole tests, one signature at a time.
+        Progress updates are sent back to the main process over a queue, and errors are returned in test order.
+        """
+        tests = [
+            (spec_ix, sig) for spec_ix, spec in enumerate(specs) for sig in _filter_signatures(spec.signatures, id)
+        ]
+        templates = [spec.template.text for spec in specs]
+
+        errors: list[FuzzError] = []
+        with Manager() as manager, FuzzProgress((sig for _, sig in tests), max_examples) as progress:
+            events: Queue[FuzzEvent] = manager.Queue()
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                mp_context=get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.definition.path, self.contract_dir, templates, PROFILER.enabled),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _run_test_in_worker,
+                        spec_ix,
+                        RemoteFuzzTask(sig, task_ix, events),
+                        max_examples,
+                        deadline,
+                        coverage_enabled,
+                        in_process,
+                        batch_size,
+                        fuzz_workspace,
+                        replay,
+                    )
+                    for task_ix, (spec_ix, sig) in enumerate(tests)
+                ]
+
+                pending = set(futures)
+                while pending:
+                    _, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    while not events.empty():
+                        progress.handle_event(events.get())
+
+                for future in futures:
+                    test_errors, samples = future.result()
+                    errors += test_errors
+                    PROFILER.merge(samples)
+
+            # Flush updates sent after the last poll
+            while not events.empty():
+                progress.handle_event(events.get())
+
+        return errors
+
+    def _run_specs_with_budget(
+        self,
+        specs: list[FuzzSpec],
+        time_budget: float,
+        id: str | None = None,
+        deadline: int | None = None,
+        coverage_enabled: bool | None = None,
+        in_process: bool = False,
+        batch_size: int = 1,
+        fuzz_workspace: Path | None = None,
+    ) -> list[FuzzError]:
+        """Fuzz the signatures of all specs in slices, sharing `time_budget` seconds between them, see `TimeBudget`.
+
+        Slices of a test resume from its examples in the example database. Coverage growth is measured for batches
+        with coverage tracking enabled, which `deploy_and_run` requires for time budgets. How the budget was spent is
+        printed once it is used up.
+        """
+        # Digests are computed once per spec, so that they are not part of the latency of a slice
+        template_digests = [_template_digest(spec.template) for spec in specs]
+        tests = {
+            sig.qualified_name: (spec.template, template_digest, sig)
+            for spec, template_digest in zip(specs, template_digests, strict=True)
+            for sig in _filter_signatures(spec.signatures, id)
+        }
+        budget = TimeBudget(tests, time_budget)
+        hits = dict.fromkeys(tests, 0)
+
+        errors: list[FuzzError] = []
+        with FuzzProgress((sig for _, _, sig in tests.values()), None) as progress:
+            tasks = {task.signature.qualified_name: task for task in progress.fuzz_tasks}
+            while (next_slice := budget.next_slice()) is not None:
+                name = next_slice.test
+                template, template_digest, signature = tests[name]
+                task = tasks[name]
+                if budget.tests[name].slices == 0:
+                    task.start()
+
+                slice_task = SliceFuzzTask(task)
+                failed = False
+                start = perf_counter()
+                try:
+                    hits[name] |= self.run_test(
+                        template,
+                        signature,
+                        next_slice.max_examples,
+                        slice_task,
+                        deadline=deadline,
+                        coverage_enabled=coverage_enabled,
+                        in_process=in_process,
+                        batch_size=batch_size,
+                        fuzz_workspace=fuzz_workspace,
+                        template_digest=template_digest,
+                    )
+                except FuzzError as e:
+                    task.fail()
+                    errors.append(e)
+                    failed = True
+
+                budget.record(
+                    name,
+                    slice_task.examples,
+                    perf_counter() - start,
+                    # Bitmap entries are 0 or 255, one per byte of contract code
+                    hits[name].bit_count() // 8,
+                    failed=failed,
+                    exhausted=slice_task.examples < next_slice.max_examples,
+                )
+
+            for name, share in budget.tests.items():
+                if share.slices and not share.failed:
+                    tasks[name].end()
+
+            budget.print_table(progress.console)
+
+        return errors
+
+    def _run_native(
+        self,
+        engine: str,
+        max_examples: int,
+        id: str | None = None,
+        coverage_enabled: bool | None = None,
+        fuzz_spec_file: Path | None = None,
+        jobs: int = 1,
+        fuzz_workspace: Path | None = None,
+    ) -> list[FuzzError]:
+        """Fuzz the test functions with the native harness of `engine`, see `NativeFuzzer`.
+
+        The harness reads the templates from `fuzz_spec_file`. If it is not given, the specs are written to a binary spec
+        file in the workspace, which defaults to the `fuzz` directory of the project cache. LibAFL campaigns run on
+        `jobs` cores.
+        """
+        if fuzz_workspace is None:
+            fuzz_workspace = project_cache_dir(self.contract_dir) / 'fuzz'
+        fuzzer = NativeFuzzer(engine, fuzz_workspace, cores=jobs)
+
+        signatures: list[Signature]
+        if fuzz_spec_file:
+            signatures = FuzzSpec.load_signatures(fuzz_spec_file, id=id)
+        else:
+            specs = self.init_specs(jobs=jobs)
+            signatures = [sig for spec in specs for sig in _filter_signatures(spec.signatures, id)]
+            fuzz_spec_file = fuzz_workspace / 'fuzz-spec.bin'
+            fuzz_workspace.mkdir(parents=True, exist_ok=True)
+            fuzz_spec_file.write_bytes(FuzzSpec.dump_binary(specs))
+
+        errors: list[FuzzError] = []
+        with FuzzProgress(signatures, max_examples) as progress:
+            for task in progress.fuzz_tasks:
+                signature = task.signature
+                with PROFILER.test(signature.qualified_name):
+                    task.start()
+                    calldata = fuzzer.run_test(
+                        fuzz_spec_file, signature, max_examples, task, coverage_enabled=bool(coverage_enabled)
+                    )
+                if calldata is None:
+                    task.end()
+                    continue
+                task.fail()
+                errors.append(FuzzError(signature.qualified_name, decode(signature.arg_types, calldata[4:])))
+
+        return errors
+
     def _load_contracts(self) -> list[ArbitrumContract]:
         if self.is_foundry:
             foundry = Foundry(self.contract_dir)
@@ -324,55 +821,151 @@ class Skribe:
         return [contract]
 
     def _create_spec(self, contract: ArbitrumContract) -> FuzzSpec:
-        template = self._create_template_pattern(contract)
+        template = self._cached_template_pattern(contract)
         signatures = tuple(Signature.from_method(method) for method in contract.methods if method.is_test)
         return FuzzSpec(template=template, signatures=signatures)
 
-    def _create_template_pattern(self, contract: ArbitrumContract) -> Pattern:
-        contract_kast: KInner
-        if isinstance(contract, StylusContract):
-            contract_kast = bytesToken(contract.deployed_bytecode)
-        else:
-            bytecode = bytes.fromhex(contract.deployed_bytecode)
-            contract_kast = bytesToken(bytecode)
+    @cached_property
+    def template_cache(self) -> FileCache:
+        return FileCache(project_cache_dir(self.contract_dir) / 'templates', suffix='.json')
+
+    def example_database(self, signature: Signature, template_digest: str) -> DirectoryBasedExampleDatabase:
+        """Hypothesis example database of a test, which keeps its failing and interesting examples across runs.
+
+        Databases are keyed on the test and the digest of its template, see `template_digest`, so examples are not
+        replayed against a changed deployment.
+        """
+        key = hash_str(json.dumps({'test': signature.qualified_name, 'template': template_digest}, sort_keys=True))
+        return DirectoryBasedExampleDatabase(project_cache_dir(self.contract_dir) / 'examples' / key)
+
+    def clean_template_cache(self) -> None:
+        """Remove all templates cached for the test contract project."""
+        self.template_cache.clean()
 
+    def clean_cache(self, user_cache: bool = False) -> None:
+        """Remove the project cache of the test contract, i.e. its templates, builds, cargo outputs, examples and fuzz
+        workspace.
+
+        Args:
+            user_cache: Whether to also remove the cache Skribe shares between projects, see `user_cache_dir`.
+        """
+        shutil.rmtree(project_cache_dir(self.contract_dir), ignore_errors=True)
+        if user_cache:
+            shutil.rmtree(user_cache_dir(), ignore_errors=True)
+
+    def _cached_template_pattern(self, contract: ArbitrumContract) -> Pattern:
+        """Load the template of `contract` from the template cache, deploying the contract only on a cache miss.
+
+        Entries are keyed on everything that goes into the deployment. Files read by the `setUp` function through
+        cheatcodes are only known after deployment, so their digests are stored in the entry and checked on load.
+        """
+        bytecode = deployed_bytecode(contract)
+        setup = setup_method(contract)
+        key = hash_str(
+            json.dumps(
+                {
+                    'skribe': version('skribe'),
+                    'definition': self.definition.digest,
+                    'contract': contract.name_with_path,
+                    'bytecode': bytecode.hex(),
+                    'setup': setup is not None,
+                    'config-vars': config_vars(),
+                    'ids': [CHEATCODE_ID, TEST_CALLER_ID, TEST_CONTRACT_ID],
+                },
+                sort_keys=True,
+            )
+        )
+
+        cached = self.template_cache.read_text(key)
+        if cached is not None:
+            entry = json.loads(cached)
+            if all(_file_digest(Path(path)) == digest for path, digest in entry['files'].items()):
+                with PROFILER.phase('kore_parse'):
+                    return KoreParser(entry['template']).pattern()
+
+        hooks = PykHooks(self.contract_dir)
+        template = self._create_template_pattern(contract, hooks)
+        entry = {
+            'template': template.text,
+            'files': {str(path): _file_digest(path) for path in sorted(hooks.read_files)},
+        }
+        self.template_cache.write_text(key, json.dumps(entry))
+        return template
+
+    def _create_template_pattern(self, contract: ArbitrumContract, hooks: PykHooks | None = None) -> Pattern:
         setup = setup_method(contract)
         if setup is not None and 0 != len(setup.inputs):
             raise TypeError('The "setUp" function cannot have any parameters')
 
-        init_config = self.deploy_test(contract_kast, setup is not None)
-        template_conf, init_subst = split_config_from(init_config)
+        init_config = self.deploy_test_pattern(deployed_bytecode(contract), setup is not None, hooks)
+
+        # Only the replaced cells are built, the rest of the deployed configuration is shared with the template
         k_steps = [
             set_exit_code(1),
-            call_stylus(TEST_CALLER_ID, TEST_CONTRACT_ID, CALLDATA, 0),
+            call_stylus(TEST_CALLER_ID, TEST_CONTRACT_ID, CALLDATA_EVAR, 0),
             check_foundry_success(),
             set_exit_code(0),
         ]
-        init_subst['K_CELL'] = steps_of(k_steps)
-        init_subst['COVERAGEENABLED_CELL'] = COVERAGE_ENABLED
-        template_conf = Subst(init_subst).apply(template_conf)
-        template_pattern = kast_to_kore(self.definition.kdefinition, template_conf, GENERATED_TOP_CELL)
+        k_cell_pattern = k_cell(k_steps)
+        coverage_enabled_cell_pattern = App(COVERAGE_ENABLED_CELL, (), (COVERAGE_ENABLED_EVAR,))
+
+        with PROFILER.phase('substitute'):
+            template_pattern = replace_cell(K_CELL_PATH, k_cell_pattern)(init_config)
+            template_pattern = replace_cell(COVERAGE_ENABLED_CELL_PATH, coverage_enabled_cell_pattern)(template_pattern)
 
         return template_pattern
 
 
+def failed_call_index(kore_text: str, calls: int) -> int:
+    """Index of the failing call in the final configuration of a failed batch of `calls` calls."""
+    # Calls that finished before the failing one have their exit codes in <batchResults>
+    results = find_cell_text(kore_text, 'batchResults') or ''
+    return min(results.count('LblListItem{}('), calls - 1)
+
+
+def _substitute_vars(pattern: Pattern, subst: Mapping[EVar, Pattern]) -> Pattern:
+    with PROFILER.phase('substitute'):
+        return substitute_vars(pattern, subst)
+
+
+def _template_digest(template: Pattern) -> str:
+    with PROFILER.phase('template_digest'):
+        return hash_str(template.text)
+
+
+def _file_digest(path: Path) -> str | None:
+    return hash_file(path) if path.is_file() else None
+
+
 class KometFuzzHandler(KFuzzHandler):
     # Fuzz handler with progress tracking
 
     definition: SkribeDefinition
-    task: FuzzTask
+    task: AbstractFuzzTask
+    seeds: FileCache | None
     failed: bool
+    covered: int
+    _last_test_time: float | None
 
-    def __init__(self, definition: SkribeDefinition, task: FuzzTask):
+    def __init__(self, definition: SkribeDefinition, task: AbstractFuzzTask, seeds: FileCache | None = None):
         self.definition = definition
         self.task = task
+        self.seeds = seeds
         self.failed = False
+        self.covered = 0
+        self._last_test_time = None
 
     def handle_test(self, args: Mapping[EVar, Pattern]) -> None:
         # Hypothesis resets the recursion limit before each test run.
         # We override it here so large Kore terms don't exceed the limit.
         sys.setrecursionlimit(RECURSION_LIMIT)
 
+        # Time between consecutive examples: execution of the previous one, and generation of this one
+        now = perf_counter()
+        if self._last_test_time is not None:
+            PROFILER.record('example', now - self._last_test_time)
+        self._last_test_time = now
+
         # Hypothesis reruns failing examples to confirm the failure.
         # To avoid misleading progress updates, the progress bar is not advanced
         # when a test fails and Hypothesis reruns the same example.
@@ -383,13 +976,28 @@ class KometFuzzHandler(KFuzzHandler):
         if not self.failed:
             self.failed = True
 
-        calldata_kast = self.definition.krun.kore_to_kast(args[CALLDATA_EVAR])
-        assert isinstance(calldata_kast, KToken)
-        calldata = pretty_bytes(calldata_kast)
+        calldata = self.calldata(args[CALLDATA_EVAR])
+        self.save_seed(calldata)
         decoded = decode(self.task.signature.arg_types, calldata[4:])
         description = self.task.signature.qualified_name
         raise FuzzError(description, decoded)
 
+    def handle_coverage(self, bitmap: bytes) -> bool:
+        """Add the coverage bitmap of an example to the union in `covered`, and return whether it covers new code."""
+        hits = int.from_bytes(bitmap, 'big')
+        new = bool(hits & ~self.covered)
+        self.covered |= hits
+        return new
+
+    def calldata(self, calldata_pattern: Pattern) -> bytes:
+        return kore_bytes(calldata_pattern)
+
+    def save_seed(self, calldata: bytes) -> None:
+        """Export `calldata` as a seed input of `skribe-fuzz`, if seeds are exported."""
+        if self.seeds is None:
+            return
+        self.seeds.write_bytes(hashlib.sha256(calldata).hexdigest(), calldata)
+
 
 class FuzzError(SkribeError):
     description: str
@@ -407,6 +1015,99 @@ class FuzzError(SkribeError):
 class InitializationError(SkribeError): ...
 
 
+class _Worker(NamedTuple):
+    skribe: Skribe
+    templates: list[str]
+    parsed: dict[int, Pattern]
+    digests: dict[int, str]
+
+    def template(self, spec_ix: int) -> Pattern:
+        if spec_ix not in self.parsed:
+            with PROFILER.phase('kore_parse'):
+                self.parsed[spec_ix] = KoreParser(self.templates[spec_ix]).pattern()
+        return self.parsed[spec_ix]
+
+    def template_digest(self, spec_ix: int) -> str:
+        # The templates are received as text, so they don't need to be printed for the digest
+        if spec_ix not in self.digests:
+            with PROFILER.phase('template_digest'):
+                self.digests[spec_ix] = hash_str(self.templates[spec_ix])
+        return self.digests[spec_ix]
+
+
+# State of the current worker process, set up once by `_init_worker`
+_WORKER: _Worker | None = None
+
+
+def _init_worker(definition_dir: Path, contract_dir: Path, templates: list[str], profile: bool) -> None:
+    global _WORKER
+    sys.setrecursionlimit(RECURSION_LIMIT)
+    if profile:
+        PROFILER.enable()
+    skribe = Skribe(SkribeDefinition(definition_dir), contract_dir)
+    _WORKER = _Worker(skribe, templates, {}, {})
+
+
+def _run_test_in_worker(
+    spec_ix: int,
+    task: RemoteFuzzTask,
+    max_examples: int,
+    deadline: int | None,
+    coverage_enabled: bool | None,
+    in_process: bool,
+    batch_size: int,
+    fuzz_workspace: Path | None,
+    replay: bool,
+) -> tuple[list[FuzzError], ProfileSamples]:
+    """Run a test in the worker process, and return its errors and the profiler samples collected meanwhile."""
+    assert _WORKER is not None, 'Worker process was not initialized'
+    errors: list[FuzzError] = []
+    try:
+        _WORKER.skribe.run_test(
+            _WORKER.template(spec_ix),
+            task.signature,
+            max_examples,
+            task,
+            deadline=deadline,
+            coverage_enabled=coverage_enabled,
+            in_process=in_process,
+            batch_size=batch_size,
+            fuzz_workspace=fuzz_workspace,
+            replay=replay,
+            template_digest=_WORKER.template_digest(spec_ix),
+        )
+    except FuzzError as e:
+        task.fail()
+        errors.append(e)
+    return errors, PROFILER.take_samples()
+
+
+# Skribe instance and test contracts of the current spec worker process, set up once by `_init_spec_worker`
+_SPEC_WORKER: tuple[Skribe, list[ArbitrumContract]] | None = None
+
+
+def _init_spec_worker(definition_dir: Path, contract_dir: Path, profile: bool) -> None:
+    global _SPEC_WORKER
+    sys.setrecursionlimit(RECURSION_LIMIT)
+    if profile:
+        PROFILER.enable()
+    skribe = Skribe(SkribeDefinition(definition_dir), contract_dir)
+    _SPEC_WORKER = (skribe, skribe._load_contracts())
+
+
+def _create_spec_in_worker(contract_ix: int) -> tuple[str, tuple[Signature, ...], ProfileSamples]:
+    """Create the spec of a test contract in the worker process, and return it with the profiler samples."""
+    assert _SPEC_WORKER is not None, 'Worker process was not initialized'
+    skribe, contracts = _SPEC_WORKER
+    spec = skribe._create_spec(contracts[contract_ix])
+    return spec.template.text, spec.signatures, PROFILER.take_samples()
+
+
+def fuzz_seed_dir(fuzz_workspace: Path, signature: Signature) -> Path:
+    """Directory of the seed inputs of a test function in a `skribe-fuzz` workspace."""
+    return fuzz_test_dir(fuzz_workspace, signature) / 'seeds'
+
+
 def _filter_signatures(signatures: Iterable[Signature], id: str | None) -> list[Signature]:
     if id is None:
         return list(signatures)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import zlib
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from pathlib import Path
+    from types import TracebackType
+    from typing import Any, Final
+
+
+# Binary container for fuzzer specifications. Layout, all integers little-endian:
+#
+#   magic      8 bytes  SPEC_FILE_MAGIC
+#   version    u32      SPEC_FILE_VERSION
+#   flags      u32      FLAG_ZLIB if the templates are zlib-compressed
+#   index_len  u64      length of the index in bytes
+#   index      JSON     [{"signatures": [...], "offset": int, "size": int}, ...]
+#   data       bytes    templates as KORE text, each at `offset` relative to the start of this section
+#
+# The index holds the signatures of each spec, so selecting a spec does not touch the bytes of the other templates.
+SPEC_FILE_MAGIC: Final = b'SKRBSPEC'
+SPEC_FILE_VERSION: Final = 1
+
+FLAG_ZLIB: Final = 1
+
+_HEADER: Final = struct.Struct('<8sIIQ')
+
+
+class SpecIndexEntry(NamedTuple):
+    signatures: tuple[Mapping[str, Any], ...]
+    offset: int
+    size: int
+
+
+def is_spec_file(file_path: Path) -> bool:
+    """Whether `file_path` starts with the magic of the binary format."""
+    with file_path.open('rb') as f:
+        return f.read(len(SPEC_FILE_MAGIC)) == SPEC_FILE_MAGIC
+
+
+def spec_file_bytes(specs: Iterable[tuple[str, Iterable[Mapping[str, Any]]]], compress: bool) -> bytes:
+    """Serialize `(template_text, signature_dicts)` pairs to the binary format."""
+    index = []
+    blobs = []
+    offset = 0
+    for template_text, signatures in specs:
+        blob = template_text.encode()
+        if compress:
+            blob = zlib.compress(blob)
+        index.append({'signatures': list(signatures), 'offset': offset, 'size': len(blob)})
+        blobs.append(blob)
+        offset += len(blob)
+
+    index_bytes = json.dumps(index).encode()
+    flags = FLAG_ZLIB if compress else 0
+    header = _HEADER.pack(SPEC_FILE_MAGIC, SPEC_FILE_VERSION, flags, len(index_bytes))
+    return b''.join([header, index_bytes, *blobs])
+
+
+class SpecFile:
+    """A memory-mapped spec file in the binary format.
+
+    Only the index is read on construction. A template is read, and decompressed, when it is requested.
+    """
+
+    entries: tuple[SpecIndexEntry, ...]
+    compressed: bool
+    _mmap: mmap.mmap
+    _data_start: int
+
+    def __init__(self, file_path: Path):
+        with file_path.open('rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self._mmap) < _HEADER.size:
+                raise ValueError(f'Truncated spec file: {file_path}')
+            magic, version, flags, index_len = _HEADER.unpack_from(self._mmap)
+            if magic != SPEC_FILE_MAGIC:
+                raise ValueError(f'Not a binary spec file: {file_path}')
+            if version != SPEC_FILE_VERSION:
+                raise ValueError(f'Unsupported spec file version {version}: {file_path}')
+
+            self._data_start = _HEADER.size + index_len
+            index = json.loads(self._mmap[_HEADER.size : self._data_start])
+            self.entries = tuple(SpecIndexEntry(tuple(dct['signatures']), dct['offset'], dct['size']) for dct in index)
+            self.compressed = bool(flags & FLAG_ZLIB)
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def __enter__(self) -> SpecFile:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def template_text(self, spec_ix: int) -> str:
+        entry = self.entries[spec_ix]
+        start = self._data_start + entry.offset
+        blob = self._mmap[start : start + entry.size]
+        if self.compressed:
+            blob = zlib.decompress(blob)
+        return blob.decode()
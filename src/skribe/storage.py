@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from mmap import ACCESS_READ, mmap
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+    from typing import Final
+
+
+# A storage file is a sequence of slots, each a 32-byte big-endian key followed by a 32-byte big-endian value
+WORD_BYTES: Final = 32
+SLOT_BYTES: Final = 2 * WORD_BYTES
+
+
+def slot_count(path: Path) -> int:
+    """Number of slots in a storage file.
+
+    Raises:
+        ValueError if the size of the file is not a multiple of `SLOT_BYTES`
+    """
+    size = path.stat().st_size
+    if size % SLOT_BYTES:
+        raise ValueError(f'Size of storage file is not a multiple of {SLOT_BYTES} bytes: {path}')
+    return size // SLOT_BYTES
+
+
+def read_storage_file(path: Path) -> Iterator[tuple[int, int]]:
+    """Stream the slots of a storage file as key-value pairs, in file order.
+
+    The file is memory-mapped, so only the words of the current slot are copied out of it.
+    """
+    end = slot_count(path) * SLOT_BYTES
+    if not end:
+        # Empty files cannot be memory-mapped
+        return
+
+    with path.open('rb') as f, mmap(f.fileno(), 0, access=ACCESS_READ) as mm:
+        for offset in range(0, end, SLOT_BYTES):
+            key = int.from_bytes(mm[offset : offset + WORD_BYTES], 'big')
+            value = int.from_bytes(mm[offset + WORD_BYTES : offset + SLOT_BYTES], 'big')
+            yield key, value
+
+
+def write_storage_file(path: Path, storage: Iterable[tuple[int, int]]) -> None:
+    """Write slots to a storage file, e.g. to dump the state of a forked chain."""
+    with path.open('wb') as f:
+        for key, value in storage:
+            f.write(key.to_bytes(WORD_BYTES, 'big'))
+            f.write(value.to_bytes(WORD_BYTES, 'big'))
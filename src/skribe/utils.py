@@ -1,44 +1,69 @@
 from __future__ import annotations
 
+import re
 from functools import cached_property
+from importlib.metadata import version
 from io import BytesIO
 from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import perf_counter
 from typing import TYPE_CHECKING
 
 from eth_abi import decode, encode
-from pyk.kast.inner import KSort, KToken
+from eth_utils import keccak
+from pyk.kast.inner import KSort
 from pyk.kast.outer import read_kast_definition
-from pyk.kast.prelude.bytes import bytesToken, pretty_bytes
-from pyk.kast.prelude.string import pretty_string
 from pyk.kdist import kdist
-from pyk.konvert import kast_to_kore, kore_to_kast
+from pyk.konvert import kast_to_kore
 from pyk.kore.manip import substitute_vars
+from pyk.kore.match import arg, inj, kore_bytes, kore_int, kore_map_of, kore_str, match_app
 from pyk.kore.parser import KoreParser
-from pyk.kore.syntax import App
+from pyk.kore.syntax import App, Pattern
 from pyk.ktool.kompile import DefinitionInfo
 from pyk.ktool.kprove import KProve
-from pyk.ktool.krun import KRun
-from pyk.utils import abs_or_rel_to
+from pyk.ktool.krun import KRun, KRunOutput, _krun, llvm_interpret_raw
+from pyk.utils import abs_or_rel_to, hash_str, run_process_2
 from pykwasm.wasm2kast import wasm2kast
 
-from skribe.kast.syntax import pyk_hook_result
+from skribe.kore.syntax import bytes_item, pyk_hook_result
+
+from .cache import LRUFileCache, user_cache_dir
+from .profiler import PROFILER
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Mapping
+    from collections.abc import Callable, Mapping, Sequence
     from subprocess import CompletedProcess
     from typing import Any, Final
 
     from pyk.kast.inner import KInner
     from pyk.kast.outer import KDefinition
-    from pyk.kore.syntax import EVar, Pattern
+    from pyk.kore.syntax import EVar
     from pyk.ktool.kompile import KompileBackend
 
+    from .cache import FileCache
+
 RECURSION_LIMIT: Final = 20000
 
 EXIT_CODE_PYK_HOOK: Final = 2
 
 STYLUS_WASM_PREFIX: Final = b'\xef\xf0\x00\x00'
 
+WASM_CACHE_MAX_BYTES: Final = 1 << 30
+
+# Position of the <k> cell in the configuration: generatedTop > stylus > foundry > kevm > k
+K_CELL_PATH: Final = (0, 1, 0, 0)
+
+# Position of the <coverageEnabled> cell in the configuration: generatedTop > stylus > coverageEnabled
+COVERAGE_ENABLED_CELL_PATH: Final = (0, 4)
+
+PYK_HOOK_SYMBOL: Final = "Lblskribe'Stop'pykHook"
+
+# Number of rewrite steps, which the interpreter prints before the configuration when run with `--statistics`
+STATISTICS_PATTERN: Final = re.compile(r'\s*(?P<steps>\d+)\n')
+
+# A pending hook is the first item of the <k> cell, which is the first cell in the configuration text
+PYK_HOOK_PATTERN: Final = re.compile(r"Lbl'-LT-'k'-GT-'\{\}\(\s*kseq\{\}\(\s*" + re.escape(PYK_HOOK_SYMBOL) + r'\{\}\(')
+
 
 class SkribeError(RuntimeError): ...
 
@@ -54,6 +79,11 @@ class SkribeDefinition:
     def path(self) -> Path:
         return self.definition_info.path
 
+    @cached_property
+    def digest(self) -> str:
+        """Identifies the kompiled definition, changes whenever the definition is rebuilt."""
+        return hash_str((str(self.path.resolve()), self.definition_info.timestamp))
+
     @cached_property
     def backend(self) -> KompileBackend:
         return self.definition_info.backend
@@ -81,113 +111,270 @@ class SkribeDefinition:
         Returns:
             The CompletedProcess of the interpreter
         """
-        kore_term = kast_to_kore(self.kdefinition, pgm, sort=sort)
-        res = self.krun.run_process(kore_term, expand_macros=False, **kwargs)
-        return res
+        with PROFILER.phase('kast_to_kore'):
+            kore_term = kast_to_kore(self.kdefinition, pgm, sort=sort)
+        return self.krun_with_kore(kore_term, **kwargs)
+
+    def krun_with_kore(self, pgm: Pattern | str, **kwargs: Any) -> CompletedProcess:
+        """Run the semantics on a KORE pattern, e.g. one built with `skribe.kore.syntax`.
+
+        Args:
+            pgm: The pattern to run, or its KORE text, of sort `EthereumSimulation`, or `GeneratedTopCell` if
+              kwargs['term'] is True
+            kwargs: Any arguments to pass to KRun.run_process
+
+        Returns:
+            The CompletedProcess of the interpreter
+        """
+        if isinstance(pgm, Pattern):
+            with PROFILER.phase('krun'):
+                return self.krun.run_process(pgm, expand_macros=False, **kwargs)
+
+        # Same as `KRun.run_process`, which only takes patterns
+        kwargs.pop('output', None)
+        with NamedTemporaryFile('w', suffix='.kore') as pgm_file:
+            pgm_file.write(pgm)
+            pgm_file.flush()
+            with PROFILER.phase('krun'):
+                return _krun(
+                    input_file=Path(pgm_file.name),
+                    definition_dir=self.path,
+                    output=KRunOutput.KORE,
+                    parser='cat',
+                    no_expand_macros=True,
+                    check=False,
+                    **kwargs,
+                )
 
     def krun_with_pyk_hooks(
-        self, pgm: KInner, hooks: PykHooks, sort: KSort | None = None, **kwargs: Any
+        self, pgm: KInner | Pattern | str, hooks: PykHooks, sort: KSort | None = None, **kwargs: Any
     ) -> CompletedProcess:
-        """Run the semantics on a kast term with Pyk hooks.
+        """Run the semantics on a kast term, a KORE pattern or KORE text with Pyk hooks.
 
         Args:
-            pgm: The kast term to run
+            pgm: The kast term, KORE pattern or KORE text to run
             hooks: Pyk hook handler
-            sort: The target sort of `pgm`. Usually `Steps`, but use `GeneratedTopCell` when running in `term` mode.
+            sort: The target sort of a kast `pgm`. Usually `Steps`, but use `GeneratedTopCell` when running in `term`
+              mode. Ignored for a KORE `pgm`, which is already sorted.
             kwargs: Any arguments to pass to KRun.run_process
 
         Returns:
             The final CompletedProcess after hook handling.
         """
         # First run the term normally.
-        proc_res = self.krun_with_kast(pgm, sort, **kwargs)
+        if isinstance(pgm, Pattern | str):
+            proc_res = self.krun_with_kore(pgm, **kwargs)
+        else:
+            proc_res = self.krun_with_kast(pgm, sort, **kwargs)
 
         # If the interpreter does not request hook handling, we're done.
         if proc_res.returncode != EXIT_CODE_PYK_HOOK:
             return proc_res
 
-        # The return code is EXIT_CODE_PYK_HOOK (2), so apply Pyk hooks
-
-        kore_term = KoreParser(proc_res.stdout).pattern()
-
-        kwargs['pmap'] = None
-        kwargs['cmap'] = None
+        # The return code is EXIT_CODE_PYK_HOOK (2), so continue execution with the hook-processing loop
+        return self.krun_term_with_pyk_hooks(proc_res.stdout, hooks, depth=kwargs.get('depth'))
 
-        # Continue execution with hook-processing loop
-        return self.krun_term_with_pyk_hooks(kore_term, hooks, **kwargs)
-
-    def krun_term_with_pyk_hooks(self, kore_term: Pattern, hooks: PykHooks, **kwargs: Any) -> CompletedProcess:
+    def krun_term_with_pyk_hooks(
+        self, kore_term: Pattern | str, hooks: PykHooks, depth: int | None = None
+    ) -> CompletedProcess:
         """Repeatedly run a Kore term, applying Pyk hooks until no hook exit code is produced.
 
+        The term is kept as KORE text between interpreter runs. Only the pending hook at the top of the <k> cell is
+        parsed and replaced, see `PykHooks.apply`.
+
         Args:
-            kore_term: The Kore term to execute.
+            kore_term: The Kore term to execute, as a pattern or as KORE text.
             hooks: Hook handler used to transform the term between interpreter runs.
-            kwargs: Extra arguments forwarded to `KRun.run_process`.
+            depth: The maximal number of rewrite steps for each interpreter run.
 
         Returns:
             The CompletedProcess of the last interpreter run.
         """
+        proc_res, _ = self._run_with_pyk_hooks(kore_term, hooks, depth, statistics=False)
+        return proc_res
+
+    def krun_term_with_statistics(
+        self, kore_term: Pattern | str, hooks: PykHooks, depth: int | None = None
+    ) -> tuple[CompletedProcess, int | None]:
+        """Like `krun_term_with_pyk_hooks`, but also count the rewrite steps of all interpreter runs.
+
+        Returns:
+            The CompletedProcess of the last interpreter run, and the total number of rewrite steps, or ``None`` if
+            the interpreter did not report them.
+        """
+        return self._run_with_pyk_hooks(kore_term, hooks, depth, statistics=True)
 
-        # Build a function that applies hooks to the <k> cell.
-        # update_nested navigates to the k cell at path [0,1,0,0].
-        apply_hooks_k_cell = update_nested([0, 1, 0, 0], lambda pat: hooks(pat, self.kdefinition))
+    def _run_with_pyk_hooks(
+        self, kore_term: Pattern | str, hooks: PykHooks, depth: int | None, statistics: bool
+    ) -> tuple[CompletedProcess, int | None]:
+        kore_text = kore_term if isinstance(kore_term, str) else kore_term.text
+        steps: int | None = 0
         while True:
             # Apply hooks before running the interpreter.
-            kore_term = apply_hooks_k_cell(kore_term)
+            kore_text = hooks.apply(kore_text, self.kdefinition)
+
+            with PROFILER.phase('interpreter'):
+                proc_res = self._interpret(kore_text, depth, statistics)
 
-            # Run the interpreter in term mode.
-            proc_res = self.krun.run_process(kore_term, term=True, expand_macros=False, **kwargs)
+            if statistics:
+                # Remove the step count, so that the output can be run again
+                match = STATISTICS_PATTERN.match(proc_res.stdout)
+                if match is None:
+                    steps = None
+                else:
+                    steps = steps + int(match['steps']) if steps is not None else None
+                    proc_res.stdout = proc_res.stdout[match.end() :]
 
             # If no hook exit code was produced, execution is finished.
             if proc_res.returncode != EXIT_CODE_PYK_HOOK:
-                return proc_res
+                return proc_res, steps
+
+            kore_text = proc_res.stdout
+
+    def _interpret(self, kore_text: str, depth: int | None, statistics: bool) -> CompletedProcess:
+        if not statistics:
+            return llvm_interpret_raw(self.path, kore_text, depth=depth, check=False)
 
-            kore_term = KoreParser(proc_res.stdout).pattern()
+        # Same as `llvm_interpret_raw`, which does not pass options to the interpreter
+        depth_arg = str(depth) if depth is not None else '-1'
+        args = [str(self.path / 'interpreter'), '/dev/stdin', depth_arg, '/dev/stdout', '--statistics']
+        return run_process_2(args, input=kore_text, check=False)
+
+
+def default_wasm_cache() -> FileCache:
+    """Cache of parsed Wasm modules shared by all Skribe projects.
+
+    Entries map the Keccak-256 hash of a Wasm module to the KORE text of the `parseWasmBytecode` Pyk hook result.
+    """
+    return LRUFileCache(user_cache_dir() / 'wasm' / version('skribe'), max_bytes=WASM_CACHE_MAX_BYTES, suffix='.kore')
 
 
 class PykHooks:
 
     project_root: Path
+    read_files: set[Path]
+    latencies: dict[str, list[float]]
+    wasm_cache: FileCache
 
-    def __init__(self, project_root: Path):
+    def __init__(self, project_root: Path, wasm_cache: FileCache | None = None):
         self.project_root = project_root
+        self.read_files = set()
+        self.latencies = {}
+        self.wasm_cache = wasm_cache if wasm_cache is not None else default_wasm_cache()
 
-    def __call__(self, kore_term: Pattern, definition: KDefinition) -> Pattern:
-        def apply_func(pat: Pattern) -> Pattern:
-            if isinstance(pat, App) and pat.symbol == "Lblskribe'Stop'pykHook":
-                func_sig = kore_to_kast(definition, pat.args[0])
-                args = kore_to_kast(definition, pat.args[1])
-
-                assert isinstance(func_sig, KToken)
-                func_sig_str = pretty_string(func_sig)
-                result: KInner
-                match func_sig_str:
-                    case 'readFile(string)':
-                        assert isinstance(args, KToken)
-                        decoded_args = decode(types=('string',), data=pretty_bytes(args))
-                        file_path = abs_or_rel_to(Path(decoded_args[0]), self.project_root)
-                        txt_content = file_path.read_text()
-                        abi_encoded_content = encode(types=('string',), args=(txt_content,))
-                        result = bytesToken(abi_encoded_content)
-                    case 'readFileBinary(string)':
-                        assert isinstance(args, KToken)
-                        decoded_args = decode(types=('string',), data=pretty_bytes(args))
-                        file_path = abs_or_rel_to(Path(decoded_args[0]), self.project_root)
-                        bin_content = file_path.read_bytes()
-                        abi_encoded_content = encode(types=('bytes',), args=(bin_content,))
-                        result = bytesToken(abi_encoded_content)
-                    case 'parseWasmBytecode(KBytes)':
-                        assert isinstance(args, KToken)
-                        bytecode = pretty_bytes(args)
-                        result = wasm2kast(BytesIO(bytecode))
-                    case _:
-                        raise ValueError(f'Unknown function {func_sig_str}')
-
-                return kast_to_kore(definition, pyk_hook_result(func_sig_str, result), KSort('KItem'))
-
-            return pat
-
-        return kore_term.bottom_up(apply_func)
+    def apply(self, kore_text: str, definition: KDefinition) -> str:
+        """Replace the pending Pyk hook at the top of the <k> cell of a configuration with its result.
+
+        The configuration is handled as KORE text: only the hook term is parsed, and the result is spliced in
+        its place. Configurations without a pending hook are returned unchanged.
+        """
+        match = PYK_HOOK_PATTERN.search(kore_text)
+        if match is None:
+            return kore_text
+
+        start = match.end() - len(PYK_HOOK_SYMBOL) - len('{}(')
+        end = kore_app_end(kore_text, match.end() - 1)
+        hook = KoreParser(kore_text[start:end]).pattern()
+        assert isinstance(hook, App)
+        return kore_text[:start] + self.handle(hook, definition) + kore_text[end:]
+
+    def handle(self, hook: App, definition: KDefinition) -> str:
+        """Compute the result of a Pyk hook call, and return it as KORE text."""
+        start_time = perf_counter()
+
+        func_sig_str = kore_str(hook.args[0])
+        args = kore_bytes(inj(hook.args[1]))
+
+        result_text: str
+        match func_sig_str:
+            case 'readFile(string)':
+                decoded_args = decode(types=('string',), data=args)
+                file_path = abs_or_rel_to(Path(decoded_args[0]), self.project_root)
+                self.read_files.add(file_path)
+                txt_content = file_path.read_text()
+                abi_encoded_content = encode(types=('string',), args=(txt_content,))
+                result_text = self._hook_result(func_sig_str, bytes_item(abi_encoded_content))
+            case 'readFileBinary(string)':
+                decoded_args = decode(types=('string',), data=args)
+                file_path = abs_or_rel_to(Path(decoded_args[0]), self.project_root)
+                self.read_files.add(file_path)
+                bin_content = file_path.read_bytes()
+                abi_encoded_content = encode(types=('bytes',), args=(bin_content,))
+                result_text = self._hook_result(func_sig_str, bytes_item(abi_encoded_content))
+            case 'parseWasmBytecode(KBytes)':
+                result_text = self._parse_wasm_bytecode(args, definition)
+            case _:
+                raise ValueError(f'Unknown function {func_sig_str}')
+
+        latency = perf_counter() - start_time
+        self.latencies.setdefault(func_sig_str, []).append(latency)
+        PROFILER.record(f'pyk_hook:{func_sig_str}', latency)
+        return result_text
+
+    def _hook_result(self, func_sig_str: str, result: Pattern) -> str:
+        return pyk_hook_result(func_sig_str, result).text
+
+    def _parse_wasm_bytecode(self, bytecode: bytes, definition: KDefinition) -> str:
+        key = keccak(bytecode).hex()
+        cached = self.wasm_cache.read_text(key)
+        if cached is not None:
+            return cached
+
+        module = wasm2kast(BytesIO(bytecode))
+        with PROFILER.phase('kast_to_kore'):
+            module_pattern = kast_to_kore(definition, module, KSort('KItem'))
+        result_text = self._hook_result('parseWasmBytecode(KBytes)', module_pattern)
+        self.wasm_cache.write_text(key, result_text)
+        return result_text
+
+
+def kore_app_end(kore_text: str, open_ix: int) -> int:
+    """Return the index after the parenthesis that closes the one at `open_ix`, skipping string literals."""
+    depth = 0
+    in_string = False
+    ix = open_ix
+    while ix < len(kore_text):
+        c = kore_text[ix]
+        if in_string:
+            if c == '\\':
+                ix += 1
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+            if depth == 0:
+                return ix + 1
+        ix += 1
+    raise ValueError('Unbalanced parentheses in KORE text')
+
+
+def find_cell_text(kore_text: str, cell_name: str) -> str | None:
+    """Return the KORE text of the first `<cell_name>` cell in `kore_text`, without parsing it."""
+    symbol = f"Lbl'-LT-'{cell_name}'-GT-'{{}}("
+    start = kore_text.find(symbol)
+    if start < 0:
+        return None
+    return kore_text[start : kore_app_end(kore_text, start + len(symbol) - 1)]
+
+
+def coverage_bitmap(kore_text: str) -> bytes:
+    """Return the coverage bitmaps in the <coverage> cell of a configuration, concatenated in account order.
+
+    This is the layout of the coverage map of `skribe-fuzz-rs`. Only the <coverage> cell is parsed.
+    """
+    cell_text = find_cell_text(kore_text, 'coverage')
+    if cell_text is None:
+        raise ValueError('Cell <coverage> not found')
+    (coverage_map,) = match_app(KoreParser(cell_text).pattern()).args
+    bitmaps = kore_map_of(
+        lambda key: kore_int(inj(key)),
+        lambda value: kore_bytes(arg(1)(match_app(inj(value), "Lbl'Hash'coverage"))),
+    )(coverage_map)
+    return b''.join(bitmap for _, bitmap in sorted(bitmaps))
 
 
 concrete_definition = SkribeDefinition(kdist.get('stylus-semantics.llvm'))
@@ -211,17 +398,28 @@ def update_arg(arg_ix: int, f: Callable[[Pattern], Pattern]) -> Callable[[Patter
     return res
 
 
-def update_nested(path: list[int], f: Callable[[Pattern], Pattern]) -> Callable[[Pattern], Pattern]:
+def update_nested(path: Sequence[int], f: Callable[[Pattern], Pattern]) -> Callable[[Pattern], Pattern]:
     for ix in reversed(path):
         f = update_arg(ix, f)
 
     return f
 
 
+def replace_cell(path: Sequence[int], cell: App) -> Callable[[Pattern], Pattern]:
+    """Replace the cell at `path` in a configuration with `cell`, sharing all other subpatterns."""
+
+    def replace(pat: Pattern) -> Pattern:
+        assert isinstance(pat, App)
+        assert pat.symbol == cell.symbol, pat.symbol
+        return cell
+
+    return update_nested(path, replace)
+
+
 def subst_on_k_cell(template: Pattern, subst: Mapping[EVar, Pattern]) -> Pattern:
     def subst_func(pat: Pattern) -> Pattern:
         assert isinstance(pat, App)
         assert pat.symbol == "Lbl'-LT-'k'-GT-'", pat.symbol
         return substitute_vars(pat, subst)
 
-    return update_nested([0, 1, 0, 0], subst_func)(template)
+    return update_nested(K_CELL_PATH, subst_func)(template)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import Any, Final
+
+    from pytest import FixtureRequest, Parser
+
+
+DEFAULT_BASELINE: Final = Path(__file__).parent / 'baseline.json'
+
+
+class Measurement(NamedTuple):
+    value: float
+    unit: str
+    higher_is_better: bool
+
+    @property
+    def dict(self) -> dict[str, Any]:
+        return {'value': self.value, 'unit': self.unit, 'higher_is_better': self.higher_is_better}
+
+
+class Benchmark:
+    """Collects measurements, to be checked against the baseline once all are recorded."""
+
+    baseline: dict[str, Any]
+    tolerance: float
+    results: dict[str, Measurement]
+
+    def __init__(self, baseline: dict[str, Any], tolerance: float):
+        self.baseline = baseline
+        self.tolerance = tolerance
+        self.results = {}
+
+    def record(self, name: str, value: float, unit: str, *, higher_is_better: bool = False) -> None:
+        self.results[name] = Measurement(value, unit, higher_is_better)
+
+    def regressions(self) -> list[str]:
+        """Describe the measurements that regressed by more than the tolerance compared to the baseline."""
+        res = []
+        for name, (value, unit, higher_is_better) in sorted(self.results.items()):
+            if name not in self.baseline:
+                continue
+
+            expected = self.baseline[name]['value']
+            if higher_is_better and value < expected * (1 - self.tolerance):
+                res.append(f'{name}: {value:.4g} {unit} is below the baseline {expected:.4g} {unit}')
+            elif not higher_is_better and value > expected * (1 + self.tolerance):
+                res.append(f'{name}: {value:.4g} {unit} is above the baseline {expected:.4g} {unit}')
+        return res
+
+    @property
+    def dict(self) -> dict[str, Any]:
+        return {name: measurement.dict for name, measurement in sorted(self.results.items())}
+
+
+def pytest_addoption(parser: Parser) -> None:
+    parser.addoption(
+        '--benchmark-output',
+        type=Path,
+        default=None,
+        help='Write the measurements to this JSON file.',
+    )
+    parser.addoption(
+        '--benchmark-baseline',
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help='JSON file with the measurements to compare against (default: src/tests/benchmark/baseline.json).',
+    )
+    parser.addoption(
+        '--benchmark-tolerance',
+        type=float,
+        default=0.25,
+        help='Allowed relative regression compared to the baseline (default: 0.25).',
+    )
+    parser.addoption(
+        '--benchmark-record',
+        action='store_true',
+        default=False,
+        help='Write the measurements to the baseline file instead of comparing against it.',
+    )
+
+
+@pytest.fixture(scope='session')
+def benchmark(request: FixtureRequest) -> Iterator[Benchmark]:
+    """Collect the measurements of the session, and fail once at the end if any regressed.
+
+    With `--benchmark-record`, the measurements are written to the baseline file instead. Otherwise a missing baseline
+    fails the session before any benchmark runs.
+    """
+    baseline_file: Path = request.config.getoption('--benchmark-baseline')
+    record: bool = request.config.getoption('--benchmark-record')
+    if record:
+        baseline = {}
+    elif baseline_file.is_file():
+        baseline = json.loads(baseline_file.read_text())
+    else:
+        pytest.fail(
+            f'Missing benchmark baseline {baseline_file}, record one with: make benchmark-baseline', pytrace=False
+        )
+    benchmark = Benchmark(baseline, request.config.getoption('--benchmark-tolerance'))
+
+    yield benchmark
+
+    output_file: Path | None = request.config.getoption('--benchmark-output')
+    if output_file is not None:
+        output_file.write_text(json.dumps(benchmark.dict, indent=2) + '\n')
+    if record:
+        baseline_file.write_text(json.dumps(benchmark.dict, indent=2) + '\n')
+
+    regressions = benchmark.regressions()
+    if regressions:
+        pytest.fail('Benchmark regressions:\n' + '\n'.join(regressions), pytrace=False)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+import pytest
+from pyk.utils import run_process
+
+from skribe.contract import StylusContract, deployed_bytecode, setup_method
+from skribe.native import parse_stats
+from skribe.progress import AbstractFuzzTask
+from skribe.skribe import FuzzError, Skribe
+from skribe.utils import RECURSION_LIMIT, PykHooks, concrete_definition
+
+if TYPE_CHECKING:
+    from typing import Final
+
+    from pytest import FixtureRequest
+
+    from skribe.contract import Signature
+    from skribe.skribe import FuzzSpec
+
+    from .conftest import Benchmark
+
+sys.setrecursionlimit(RECURSION_LIMIT)
+
+CONTRACTS_DIR = (Path(__file__).parent.parent / 'integration' / 'data' / 'contracts').resolve(strict=True)
+TEST_CONTRACT_DIRS = sorted(CONTRACTS_DIR.glob('test*'))
+
+FUZZ_RS_DIR = Path(__file__).parents[3] / 'skribe-fuzz-rs'
+RUST_HARNESSES: Final = {
+    'libafl': Path(os.environ.get('SKRIBE_FUZZ', FUZZ_RS_DIR / 'target/release/skribe-fuzz')),
+    'libfuzzer': Path(
+        os.environ.get(
+            'SKRIBE_FUZZ_LIBFUZZER',
+            FUZZ_RS_DIR / 'target/x86_64-unknown-linux-gnu/release/fuzz_target_1',
+        )
+    ),
+}
+
+MAX_EXAMPLES: Final = 50
+
+# Calls per example of the coverage benchmarks, coverage is only measured for batches
+BATCH_SIZE: Final = 10
+
+
+class CountingFuzzTask(AbstractFuzzTask):
+    signature: Signature
+    examples: int
+
+    def __init__(self, signature: Signature):
+        self.signature = signature
+        self.examples = 0
+
+    def start(self) -> None: ...
+
+    def end(self) -> None: ...
+
+    def advance(self) -> None:
+        self.examples += 1
+
+    def fail(self) -> None: ...
+
+
+@pytest.fixture(scope='module', params=TEST_CONTRACT_DIRS, ids=lambda p: p.name)
+def skribe(request: FixtureRequest, benchmark: Benchmark) -> Skribe:
+    contract_dir: Path = request.param
+    skribe = Skribe(concrete_definition, contract_dir)
+
+    # A cold build ignores the build cache, a warm build of the unchanged contract only checks its fingerprint
+    start = perf_counter()
+    skribe.build_contract(force=True)
+    benchmark.record(f'build/cold/{contract_dir.name}', perf_counter() - start, 's')
+
+    start = perf_counter()
+    skribe.build_contract()
+    benchmark.record(f'build/warm/{contract_dir.name}', perf_counter() - start, 's')
+
+    return skribe
+
+
+@pytest.fixture(scope='module')
+def specs(skribe: Skribe) -> list[FuzzSpec]:
+    skribe.clean_template_cache()
+    return skribe.init_specs()
+
+
+def test_abi_export(skribe: Skribe, benchmark: Benchmark) -> None:
+    if skribe.is_foundry:
+        pytest.skip('The ABI of Foundry contracts is read from the build artifacts')
+
+    contract = StylusContract(cargo_bin=skribe._cargo_bin, contract_dir=skribe.contract_dir)
+    contract.clean_cache()
+
+    start = perf_counter()
+    abi = contract.abi
+    benchmark.record(f'abi_export/{skribe.contract_dir.name}', perf_counter() - start, 's')
+
+    assert abi
+
+
+def test_deploy(skribe: Skribe, benchmark: Benchmark) -> None:
+    for contract in skribe._load_contracts():
+        name = f'{skribe.contract_dir.name}/{contract.name_with_path}'
+        hooks = PykHooks(skribe.contract_dir)
+
+        start = perf_counter()
+        skribe.deploy_test(deployed_bytecode(contract), setup_method(contract) is not None, hooks)
+        benchmark.record(f'deploy_test/{name}', perf_counter() - start, 's')
+
+        latencies = [latency for func_latencies in hooks.latencies.values() for latency in func_latencies]
+        benchmark.record(f'pyk_hooks/{name}', sum(latencies), 's')
+
+
+def test_template_size(skribe: Skribe, specs: list[FuzzSpec], benchmark: Benchmark) -> None:
+    for spec in specs:
+        for signature in spec.signatures[:1]:
+            name = f'{skribe.contract_dir.name}/{signature.contract_name}'
+            benchmark.record(f'template_size/{name}', len(spec.template.text), 'B')
+
+
+def test_python_throughput(skribe: Skribe, specs: list[FuzzSpec], benchmark: Benchmark) -> None:
+    for spec in specs:
+        for signature in spec.signatures[:1]:
+            task = CountingFuzzTask(signature)
+
+            start = perf_counter()
+            try:
+                skribe.run_test(spec.template, signature, MAX_EXAMPLES, task)
+            except FuzzError:
+                pass
+            elapsed = perf_counter() - start
+
+            name = f'{skribe.contract_dir.name}/{signature.qualified_name}'
+            benchmark.record(
+                f'examples_per_second/python/{name}', task.examples / elapsed, '1/s', higher_is_better=True
+            )
+
+
+@pytest.mark.parametrize('coverage_enabled', [False, True], ids=['no-coverage', 'coverage'])
+def test_coverage_throughput(
+    coverage_enabled: bool, skribe: Skribe, specs: list[FuzzSpec], benchmark: Benchmark
+) -> None:
+    # Every first hit of an instruction updates the coverage bitmap of the contract, whose size is the size of the
+    # code. Compare against a run without coverage to track the overhead, which grows with the size of the contracts.
+    for spec in specs:
+        for signature in spec.signatures[:1]:
+            task = CountingFuzzTask(signature)
+
+            start = perf_counter()
+            try:
+                skribe.run_test(
+                    spec.template,
+                    signature,
+                    MAX_EXAMPLES // BATCH_SIZE,
+                    task,
+                    coverage_enabled=coverage_enabled,
+                    batch_size=BATCH_SIZE,
+                )
+            except FuzzError:
+                pass
+            elapsed = perf_counter() - start
+
+            variant = 'coverage' if coverage_enabled else 'no_coverage'
+            name = f'{skribe.contract_dir.name}/{signature.qualified_name}'
+            benchmark.record(
+                f'batches_per_second/{variant}/{name}', task.examples / elapsed, '1/s', higher_is_better=True
+            )
+
+
+@pytest.mark.parametrize('harness', RUST_HARNESSES)
+def test_rust_throughput(
+    harness: str, skribe: Skribe, specs: list[FuzzSpec], benchmark: Benchmark, tmp_path: Path
+) -> None:
+    harness_bin = RUST_HARNESSES[harness]
+    if not harness_bin.is_file():
+        pytest.skip(f'{harness_bin} is not built')
+
+    fuzz_spec_file = tmp_path / 'fuzz-spec.json'
+    fuzz_spec_file.write_text(json.dumps([spec.dict for spec in specs]))
+
+    for spec in specs:
+        for signature in spec.signatures[:1]:
+            args: list[str]
+            match harness:
+                case 'libafl':
+                    args = [
+                        f'--iterations={MAX_EXAMPLES}',
+                        f'--workspace={tmp_path / "workspace"}',
+                        f'--fuzz-spec={fuzz_spec_file}',
+                        f'--contract-name={signature.contract_name}',
+                        f'--function-name={signature.name}',
+                    ]
+                case 'libfuzzer':
+                    args = [
+                        f'-runs={MAX_EXAMPLES}',
+                        f'--fuzz-spec={fuzz_spec_file}',
+                        f'--contract-name={signature.contract_name}',
+                        f'--function-name={signature.name}',
+                    ]
+
+            proc_res = run_process([str(harness_bin), *args], cwd=tmp_path, check=False, pipe_stderr=True)
+
+            if proc_res.returncode:
+                # The harness stops at the first failing input, so the run is not comparable
+                continue
+
+            # Use the rate the harness reports, which leaves out its startup and the loading of the spec
+            output = proc_res.stdout.splitlines() + proc_res.stderr.splitlines()
+            stats = [line_stats for line_stats in map(parse_stats, output) if line_stats is not None]
+            assert stats, f'{harness_bin} reported no statistics'
+            execs_per_sec = stats[-1].execs_per_sec
+            if not execs_per_sec:
+                # libFuzzer reports no rate for campaigns shorter than a second
+                continue
+
+            name = f'{skribe.contract_dir.name}/{signature.qualified_name}'
+            benchmark.record(f'examples_per_second/{harness}/{name}', execs_per_sec, '1/s', higher_is_better=True)
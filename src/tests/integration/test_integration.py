@@ -1,12 +1,24 @@
+import json
+import re
+import shutil
 import sys
 from pathlib import Path
 
 import pytest
+from pyk.kast.inner import KSort
+from pyk.kast.prelude.bytes import bytesToken
 from pyk.kdist import kdist
+from pyk.konvert import kast_to_kore
+from pyk.kore.prelude import LBL_MAP, bytes_dv, dv
+from pyk.kore.syntax import App, LeftAssoc, Pattern
 from pyk.ktool.krun import _krun
 
 from skribe import simulation
-from skribe.skribe import Skribe
+from skribe.build import build_foundry
+from skribe.kast import syntax as kast_syntax
+from skribe.kore import syntax as kore_syntax
+from skribe.simulation import call_data
+from skribe.skribe import CALLDATAS_EVAR, COVERAGE_ENABLED_EVAR, Skribe, failed_call_index
 from skribe.utils import RECURSION_LIMIT, concrete_definition
 
 sys.setrecursionlimit(RECURSION_LIMIT)
@@ -25,6 +37,24 @@ CONTRACTS_DIR = DATA_DIR / 'contracts'
 TEST_CONTRACT_DIRS = CONTRACTS_DIR.glob('test*')
 
 
+def copy_project(project_dir: Path, tmp_path: Path) -> Path:
+    """Copy a test contract project to `tmp_path`, so that its caches and build outputs are not shared between tests."""
+    res = tmp_path / project_dir.name
+    shutil.copytree(project_dir, res, ignore=shutil.ignore_patterns('target', 'out', 'cache', '.skribe'))
+
+    # Relative path dependencies are resolved from the original project
+    manifest = res / 'Cargo.toml'
+    if manifest.is_file():
+        manifest.write_text(
+            re.sub(
+                r'path = "(\.\./[^"]*)"',
+                lambda match: f'path = "{(project_dir / match[1]).resolve()}"',
+                manifest.read_text(),
+            )
+        )
+    return res
+
+
 @pytest.mark.parametrize('program', TEST_WAST_FILES, ids=str)
 def test_run_wast(program: Path, tmp_path: Path) -> None:
     _krun(
@@ -42,6 +72,22 @@ def test_simulation(test_file: Path) -> None:
     simulation.run(test_file, depth=None).check_returncode()
 
 
+def test_simulation_run_all(tmp_path: Path) -> None:
+    test_files = sorted(SIMULATION_DIR.glob('*.json'))
+    json_file = tmp_path / 'summary.json'
+    junit_file = tmp_path / 'summary.xml'
+
+    results = simulation.run_all(test_files, jobs=4)
+    simulation.write_json_summary(results, json_file)
+    simulation.write_junit_summary(results, junit_file)
+
+    assert [result.test_file for result in results] == test_files
+    assert all(result.passed for result in results)
+    assert all(result.steps for result in results)
+    assert [entry['file'] for entry in json.loads(json_file.read_text())] == [str(path) for path in test_files]
+    assert junit_file.is_file()
+
+
 BUILD_AND_FUZZ_TEST_FAIL = {
     'test-foundry-simple': {
         'AssertTest.test_failing_branch',
@@ -67,3 +113,190 @@ def test_build_and_fuzz(contract_dir: Path) -> None:
         assert BUILD_AND_FUZZ_TEST_FAIL[contract_dir.name] == {e.description for e in errors}
     else:
         assert not errors
+
+
+def test_fuzz_parallel() -> None:
+    contract_dir = CONTRACTS_DIR / 'test-foundry-simple'
+
+    skribe = Skribe(concrete_definition, contract_dir)
+
+    skribe.build_contract()
+
+    errors = skribe.deploy_and_run(100, jobs=2)
+
+    assert BUILD_AND_FUZZ_TEST_FAIL[contract_dir.name] == {e.description for e in errors}
+
+
+def test_fuzz_in_process() -> None:
+    contract_dir = CONTRACTS_DIR / 'test-foundry-simple'
+
+    skribe = Skribe(concrete_definition, contract_dir)
+
+    skribe.build_contract()
+
+    errors = skribe.deploy_and_run(100, in_process=True)
+
+    assert BUILD_AND_FUZZ_TEST_FAIL[contract_dir.name] == {e.description for e in errors}
+
+
+def test_template_cache(tmp_path: Path) -> None:
+    contract_dir = copy_project(CONTRACTS_DIR / 'test-hello-world', tmp_path)
+
+    skribe = Skribe(concrete_definition, contract_dir)
+
+    skribe.build_contract()
+    skribe.clean_template_cache()
+
+    specs = skribe.init_specs()
+    cached_specs = skribe.init_specs()
+
+    assert specs == cached_specs
+    assert any(skribe.template_cache.cache_dir.iterdir())
+
+    skribe.clean_template_cache()
+
+    assert not skribe.template_cache.cache_dir.exists()
+
+
+def test_init_specs_parallel(tmp_path: Path) -> None:
+    contract_dir = copy_project(CONTRACTS_DIR / 'test-foundry-simple', tmp_path)
+
+    skribe = Skribe(concrete_definition, contract_dir)
+
+    skribe.build_contract()
+    skribe.clean_template_cache()
+
+    specs = skribe.init_specs(jobs=2)
+
+    assert len(specs) > 1
+    assert specs == skribe.init_specs()
+
+
+@pytest.mark.parametrize('coverage_enabled', [False, True], ids=['no-coverage', 'coverage'])
+def test_fuzz_batch(coverage_enabled: bool) -> None:
+    contract_dir = CONTRACTS_DIR / 'test-foundry-simple'
+
+    skribe = Skribe(concrete_definition, contract_dir)
+
+    skribe.build_contract()
+
+    errors = skribe.deploy_and_run(20, batch_size=10, coverage_enabled=coverage_enabled)
+
+    assert BUILD_AND_FUZZ_TEST_FAIL[contract_dir.name] == {e.description for e in errors}
+
+
+def test_fuzz_batch_after_assume() -> None:
+    contract_dir = CONTRACTS_DIR / 'test-hello-world'
+
+    skribe = Skribe(concrete_definition, contract_dir)
+
+    skribe.build_contract()
+
+    spec = next(spec for spec in skribe.init_specs() if any(sig.name == 'testCallIncrement' for sig in spec.signatures))
+    # Rejected by `assume(x < U256::MAX)`, then a call to a function the test contract does not have
+    rejected = call_data('testCallIncrement', ['uint256'], [2**256 - 1])
+    failing = bytes.fromhex('deadbeef')
+    subst = {CALLDATAS_EVAR: kore_syntax.bytes_list([dv(rejected), dv(failing)]), COVERAGE_ENABLED_EVAR: dv(False)}
+
+    proc_res = skribe.run_batch(skribe.batch_template(spec.template), subst)
+
+    assert proc_res.returncode != 0
+    assert failed_call_index(proc_res.stdout, 2) == 1
+
+
+def test_time_budget_without_coverage() -> None:
+    skribe = Skribe(concrete_definition, CONTRACTS_DIR / 'test-hello-world')
+
+    # Rejected before the test contract is deployed
+    with pytest.raises(ValueError):
+        skribe.deploy_and_run(100, time_budget=10.0)
+
+
+def test_export_seeds(tmp_path: Path) -> None:
+    contract_dir = CONTRACTS_DIR / 'test-foundry-simple'
+
+    skribe = Skribe(concrete_definition, contract_dir)
+
+    skribe.build_contract()
+
+    errors = skribe.deploy_and_run(100, fuzz_workspace=tmp_path)
+
+    seeded = {f'{seed_dir.parent.parent.name}.{seed_dir.parent.name}' for seed_dir in tmp_path.glob('*/*/seeds')}
+    assert seeded == {e.description for e in errors}
+
+
+def test_replay() -> None:
+    contract_dir = CONTRACTS_DIR / 'test-foundry-simple'
+
+    skribe = Skribe(concrete_definition, contract_dir)
+
+    skribe.build_contract()
+
+    errors = skribe.deploy_and_run(100)
+    replayed_errors = skribe.deploy_and_run(100, replay=True)
+
+    assert {e.description for e in errors} == {e.description for e in replayed_errors}
+
+
+def test_incremental_build(tmp_path: Path) -> None:
+    contract_dir = copy_project(CONTRACTS_DIR / 'test-foundry-simple', tmp_path)
+
+    build_foundry(contract_dir)
+
+    assert not build_foundry(contract_dir)
+    assert build_foundry(contract_dir, force=True)
+
+
+def test_kore_syntax() -> None:
+    kast_program = kast_syntax.steps_of(
+        [
+            kast_syntax.set_exit_code(1),
+            kast_syntax.new_account(7),
+            kast_syntax.set_balance(7, 100),
+            kast_syntax.set_contract(8, bytesToken(b'\x00'), {1: 2}),
+            kast_syntax.call_stylus(7, 8, bytesToken(b'\x01\x02'), 0),
+            kast_syntax.call_stylus(None, 8, bytesToken(b''), 3),
+            kast_syntax.check_output(b'\x03'),
+            kast_syntax.check_foundry_success(),
+            kast_syntax.cache_stylus_modules(),
+        ]
+    )
+    kore_program = kore_syntax.simulation(
+        [
+            kore_syntax.set_exit_code(1),
+            kore_syntax.new_account(7),
+            kore_syntax.set_balance(7, 100),
+            kore_syntax.set_contract(8, b'\x00', [(1, 2)]),
+            kore_syntax.call_stylus(7, 8, bytes_dv(b'\x01\x02'), 0),
+            kore_syntax.call_stylus(None, 8, bytes_dv(b''), 3),
+            kore_syntax.check_output(b'\x03'),
+            kore_syntax.check_foundry_success(),
+            kore_syntax.cache_stylus_modules(),
+        ]
+    )
+
+    expected = kast_to_kore(concrete_definition.kdefinition, kast_program, KSort('EthereumSimulation'))
+
+    assert kore_program == expected
+
+
+def test_kore_storage_map() -> None:
+    storage = {slot: slot * 2 for slot in range(10)}
+    kast_storage = kast_syntax.set_contract(8, bytesToken(b''), storage).args[2]
+
+    expected = kast_to_kore(concrete_definition.kdefinition, kast_storage, KSort('Map'))
+    kore_storage = kore_syntax.storage_map(storage.items())
+
+    # The KAST path nests the concatenations, the KORE builder uses a flat `\left-assoc` application
+    assert _map_items(kore_storage) == _map_items(expected)
+
+    with pytest.raises(ValueError):
+        kore_syntax.storage_map([(1, 2), (1, 3)])
+
+
+def _map_items(pattern: Pattern) -> list[Pattern]:
+    if isinstance(pattern, LeftAssoc):
+        pattern = pattern.pattern
+    if isinstance(pattern, App) and pattern.symbol == LBL_MAP.value:
+        return [item for arg in pattern.args for item in _map_items(arg)]
+    return [pattern]
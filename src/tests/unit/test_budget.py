@@ -0,0 +1,64 @@
+from skribe.budget import PROBE_EXAMPLES, Slice, TimeBudget
+
+
+def test_probe_each_test_first() -> None:
+    budget = TimeBudget(['a', 'b'], 100.0)
+
+    assert budget.next_slice() == Slice('a', PROBE_EXAMPLES)
+    budget.record('a', PROBE_EXAMPLES, 1.0, 0)
+    assert budget.next_slice() == Slice('b', PROBE_EXAMPLES)
+
+
+def test_shorten_probes_to_fit_budget() -> None:
+    tests = [f't{i}' for i in range(20)]
+    budget = TimeBudget(tests, 10.0)
+    budget.record('t0', PROBE_EXAMPLES, 2.0, 0)
+
+    # 8 seconds remain for 19 probes of 0.2 seconds per example
+    assert budget.next_slice() == Slice('t1', 2)
+
+    while (slice := budget.next_slice()) is not None and budget.tests[slice.test].slices == 0:
+        budget.record(slice.test, slice.max_examples, 0.2 * slice.max_examples, 0)
+
+    # All tests are probed within the budget
+    assert all(test.slices == 1 for test in budget.tests.values())
+    assert budget.remaining > 0
+
+
+def test_share_time_equally_without_coverage() -> None:
+    budget = TimeBudget(['cheap', 'expensive'], 42.0)
+    budget.record('cheap', 10, 1.0, 0)
+    budget.record('expensive', 10, 10.0, 0)
+
+    # The cheap test has spent less time, so it runs 31 / 4 seconds worth of examples
+    assert budget.next_slice() == Slice('cheap', 77)
+    budget.record('cheap', 77, 7.7, 0)
+    assert budget.next_slice() == Slice('cheap', 58)
+
+
+def test_prefer_productive_tests() -> None:
+    budget = TimeBudget(['saturated', 'productive'], 100.0)
+    budget.record('saturated', 10, 1.0, 0)
+    budget.record('productive', 10, 2.0, 5)
+
+    slice = budget.next_slice()
+    assert slice is not None
+    assert slice.test == 'productive'
+
+    budget.record('productive', slice.max_examples, 10.0, 5)
+    assert budget.tests['productive'].saturated
+
+    slice = budget.next_slice()
+    assert slice is not None
+    assert slice.test == 'saturated'
+
+
+def test_stop() -> None:
+    budget = TimeBudget(['failing', 'exhausted', 'passing'], 10.0)
+    budget.record('failing', 1, 0.5, 0, failed=True)
+    budget.record('exhausted', 3, 0.5, 0, exhausted=True)
+    assert budget.next_slice() == Slice('passing', PROBE_EXAMPLES)
+
+    budget.record('passing', PROBE_EXAMPLES, 9.0, 0)
+    assert budget.remaining == 0
+    assert budget.next_slice() is None
@@ -0,0 +1,36 @@
+import os
+from pathlib import Path
+
+from skribe.cache import FileCache, LRUFileCache
+
+
+def test_file_cache(tmp_path: Path) -> None:
+    cache = FileCache(tmp_path / '.skribe' / 'templates', suffix='.json')
+
+    assert cache.read_text('key') is None
+
+    cache.write_text('key', 'value')
+
+    assert cache.read_text('key') == 'value'
+    assert (tmp_path / '.skribe' / '.gitignore').read_text() == '*\n'
+
+    cache.clean()
+
+    assert cache.read_text('key') is None
+
+
+def test_lru_file_cache(tmp_path: Path) -> None:
+    cache = LRUFileCache(tmp_path, max_bytes=2)
+    cache.write_bytes('a', b'a')
+    cache.write_bytes('b', b'b')
+    os.utime(cache.path('a'), ns=(0, 0))
+    os.utime(cache.path('b'), ns=(1, 1))
+
+    # A hit makes 'a' the most recently used entry
+    assert cache.read_bytes('a') == b'a'
+
+    cache.write_bytes('c', b'c')
+
+    assert cache.read_bytes('a') == b'a'
+    assert cache.read_bytes('b') is None
+    assert cache.read_bytes('c') == b'c'
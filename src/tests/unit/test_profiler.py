@@ -0,0 +1,27 @@
+from skribe.profiler import SETUP, PhaseStats, Profiler
+
+
+def test_phase_stats() -> None:
+    stats = PhaseStats.of([float(i) for i in range(100, 0, -1)])
+
+    assert stats == PhaseStats(count=100, total=5050.0, mean=50.5, p50=50.0, p99=99.0)
+
+
+def test_profiler() -> None:
+    profiler = Profiler()
+
+    profiler.record('krun', 1.0)
+    assert not profiler.samples
+
+    profiler.enable()
+    profiler.record('krun', 1.0)
+    with profiler.test('Test.test_a'):
+        profiler.record('example', 2.0)
+        profiler.record('example', 4.0)
+
+    samples = profiler.take_samples()
+    assert samples == {SETUP: {'krun': [1.0]}, 'Test.test_a': {'example': [2.0, 4.0]}}
+    assert not profiler.samples
+
+    profiler.merge(samples)
+    assert profiler.stats()['Test.test_a']['example'].mean == 3.0
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+
+from skribe.spec_file import SpecFile, is_spec_file, spec_file_bytes
+
+SIGNATURE = {'contract_name': 'TestContract', 'name': 'test_foo', 'arg_types': ['uint256']}
+
+
+@pytest.mark.parametrize('compress', [False, True], ids=['plain', 'zlib'])
+def test_spec_file(tmp_path: Path, compress: bool) -> None:
+    file_path = tmp_path / 'specs.bin'
+    specs = [('X:SortGeneratedTopCell{}', [SIGNATURE]), ('Y:SortGeneratedTopCell{}' * 100, [])]
+
+    file_path.write_bytes(spec_file_bytes(specs, compress=compress))
+
+    assert is_spec_file(file_path)
+    with SpecFile(file_path) as spec_file:
+        assert spec_file.compressed == compress
+        assert [entry.signatures for entry in spec_file.entries] == [(SIGNATURE,), ()]
+        assert [spec_file.template_text(i) for i in range(len(specs))] == [template for template, _ in specs]
+
+
+def test_json_is_not_spec_file(tmp_path: Path) -> None:
+    file_path = tmp_path / 'specs.json'
+    file_path.write_text('[]')
+
+    assert not is_spec_file(file_path)
+    with pytest.raises(ValueError, match='Truncated'):
+        SpecFile(file_path)
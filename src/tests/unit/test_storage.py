@@ -0,0 +1,31 @@
+from pathlib import Path
+
+import pytest
+
+from skribe.storage import SLOT_BYTES, read_storage_file, slot_count, write_storage_file
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    storage_file = tmp_path / 'storage.bin'
+    slots = [(0, 1), (2**256 - 1, 0), (42, 2**255)]
+
+    write_storage_file(storage_file, slots)
+
+    assert storage_file.stat().st_size == len(slots) * SLOT_BYTES
+    assert slot_count(storage_file) == len(slots)
+    assert list(read_storage_file(storage_file)) == slots
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    storage_file = tmp_path / 'storage.bin'
+    storage_file.write_bytes(b'')
+
+    assert list(read_storage_file(storage_file)) == []
+
+
+def test_truncated_file(tmp_path: Path) -> None:
+    storage_file = tmp_path / 'storage.bin'
+    storage_file.write_bytes(bytes(SLOT_BYTES + 1))
+
+    with pytest.raises(ValueError):
+        list(read_storage_file(storage_file))